@@ -1,8 +1,11 @@
 import streamlit as st
-import yfinance as yf
 import pandas as pd
+import numpy as np
 import plotly.express as px
-from datetime import datetime, timedelta
+import plotly.graph_objects as go
+from datetime import datetime
+import indicators
+import yf_utils
 
 # Set page config for better layout
 st.set_page_config(
@@ -73,31 +76,47 @@ stocks = {
 # Calculate performance for all stocks
 @st.cache_data(ttl=3600)  # Cache for 1 hour
 def get_stock_performance():
-    end_date = datetime.now()
-    start_date = end_date - timedelta(days=30)  # 30-day performance
-    
-    performance_data = []
-    for stock_name, symbol in stocks.items():
-        try:
-            stock = yf.Ticker(symbol)
-            # Use period instead of start/end dates for more reliable data
-            hist = stock.history(period="1mo")
-            if not hist.empty and len(hist) > 1:
-                initial_price = hist['Close'].iloc[0]
-                final_price = hist['Close'].iloc[-1]
-                performance = ((final_price - initial_price) / initial_price) * 100
-                performance_data.append({
-                    'Stock': stock_name,
-                    'Symbol': symbol,
-                    'Performance': performance,
-                    'Current Price': final_price,
-                    'Volume': hist['Volume'].mean()
-                })
-        except Exception as e:
-            st.warning(f"Error fetching data for {stock_name}: {str(e)}")
-            continue
-    
-    return pd.DataFrame(performance_data)
+    symbols = list(stocks.values())
+    symbol_names = pd.Series(list(stocks.keys()), index=symbols)
+
+    # One batched request for all tickers; yfinance fans it out over its own threads
+    data = yf_utils.download(symbols, fields=['Close', 'Volume'], ttl=3600, period="1mo",
+                             group_by='ticker', auto_adjust=True)
+    if data.empty:
+        return pd.DataFrame()
+
+    closes = data.xs('Close', level=1, axis=1).reindex(columns=symbols)
+    volumes = data.xs('Volume', level=1, axis=1).reindex(columns=symbols)
+
+    # A return needs at least two closing prices
+    valid = closes.count() > 1
+    for symbol in closes.columns[~valid]:
+        st.warning(f"Error fetching data for {symbol_names[symbol]}: no price history returned")
+
+    initial_price = closes.bfill().iloc[0]
+    final_price = closes.ffill().iloc[-1]
+    performance_df = pd.DataFrame({
+        'Stock': symbol_names,
+        'Symbol': symbols,
+        'Performance': (final_price / initial_price - 1) * 100,
+        'Current Price': final_price,
+        'Volume': volumes.mean().fillna(0)
+    })
+    # Arrow-backed strings avoid object columns and convert to Arrow without a copy;
+    # numbers stay float64 so high-priced stocks display exactly
+    return performance_df[valid].reset_index(drop=True).astype({
+        'Stock': 'string[pyarrow]',
+        'Symbol': 'string[pyarrow]'
+    })
+
+# Single-stock lookups, cached so widget changes don't refetch from Yahoo
+@st.cache_data(ttl=3600)  # Cache for 1 hour
+def get_ticker_info(symbol):
+    return yf_utils.get_ticker(symbol).info
+
+@st.cache_data(ttl=3600)  # Cache for 1 hour
+def get_ticker_history(symbol, period):
+    return yf_utils.get_ticker(symbol).history(period=period)
 
 # Get and sort performance data
 try:
@@ -105,8 +124,12 @@ try:
     if performance_df.empty:
         st.error("No data available. Please try again later.")
     else:
-        top_10 = performance_df.nlargest(10, 'Performance')
-        bottom_10 = performance_df.nsmallest(10, 'Performance')
+        # A single O(N) partition gives both ends instead of two separate sorts
+        performance = performance_df['Performance'].to_numpy()
+        k = min(10, len(performance))
+        order = np.argpartition(performance, (k - 1, len(performance) - k))
+        top_10 = performance_df.iloc[order[-k:]].sort_values('Performance', ascending=False)
+        bottom_10 = performance_df.iloc[order[:k]].sort_values('Performance')
 except Exception as e:
     st.error(f"Error processing stock data: {str(e)}")
     st.stop()
@@ -117,18 +140,22 @@ col1, col2 = st.columns(2)
 
 with col1:
     # Top performers bar chart
-    fig_top = px.bar(
-        top_10,
-        x='Stock',
-        y='Performance',
-        title='Top 10 Performers',
-        color='Performance',
-        color_continuous_scale='Greens',
-        text='Performance',
-        labels={'Performance': '30-Day Return (%)'}
-    )
-    fig_top.update_traces(texttemplate='%{text:.2f}%', textposition='outside')
+    fig_top = go.Figure(go.Bar(
+        x=top_10['Stock'],
+        y=top_10['Performance'],
+        text=top_10['Performance'],
+        texttemplate='%{text:.2f}%',
+        textposition='outside',
+        marker=dict(
+            color=top_10['Performance'],
+            colorscale='Greens',
+            showscale=True,
+            colorbar=dict(title='30-Day Return (%)')
+        )
+    ))
     fig_top.update_layout(
+        title='Top 10 Performers',
+        xaxis_title='Stock',
         xaxis_tickangle=-45,
         yaxis_title='Return (%)',
         showlegend=False,
@@ -138,18 +165,22 @@ with col1:
 
 with col2:
     # Bottom performers bar chart
-    fig_bottom = px.bar(
-        bottom_10,
-        x='Stock',
-        y='Performance',
-        title='Bottom 10 Performers',
-        color='Performance',
-        color_continuous_scale='Reds',
-        text='Performance',
-        labels={'Performance': '30-Day Return (%)'}
-    )
-    fig_bottom.update_traces(texttemplate='%{text:.2f}%', textposition='outside')
+    fig_bottom = go.Figure(go.Bar(
+        x=bottom_10['Stock'],
+        y=bottom_10['Performance'],
+        text=bottom_10['Performance'],
+        texttemplate='%{text:.2f}%',
+        textposition='outside',
+        marker=dict(
+            color=bottom_10['Performance'],
+            colorscale='Reds',
+            showscale=True,
+            colorbar=dict(title='30-Day Return (%)')
+        )
+    ))
     fig_bottom.update_layout(
+        title='Bottom 10 Performers',
+        xaxis_title='Stock',
         xaxis_tickangle=-45,
         yaxis_title='Return (%)',
         showlegend=False,
@@ -159,15 +190,15 @@ with col2:
 
 # Add a line chart showing all stocks' performance
 st.markdown("### 📊 All Stocks Performance")
-fig_all = px.line(
-    performance_df.sort_values('Performance'),
-    x='Stock',
-    y='Performance',
-    title='All Stocks 30-Day Performance',
-    markers=True,
-    labels={'Performance': 'Return (%)'}
-)
+sorted_performance = performance_df.sort_values('Performance')
+fig_all = go.Figure(go.Scatter(
+    x=sorted_performance['Stock'],
+    y=sorted_performance['Performance'],
+    mode='lines+markers'
+))
 fig_all.update_layout(
+    title='All Stocks 30-Day Performance',
+    xaxis_title='Stock',
     xaxis_tickangle=-45,
     yaxis_title='Return (%)',
     height=500,
@@ -182,21 +213,17 @@ col1, col2 = st.columns(2)
 with col1:
     st.markdown("#### Top Performers")
     st.dataframe(
-        top_10[['Stock', 'Performance']]
-        .style
-        .format({'Performance': '{:.2f}%'})
-        .background_gradient(cmap='Greens')
-        .set_properties(**{'text-align': 'left'})
+        top_10[['Stock', 'Performance']],
+        column_config={'Performance': st.column_config.NumberColumn(format='%.2f%%')},
+        hide_index=True
     )
 
 with col2:
     st.markdown("#### Bottom Performers")
     st.dataframe(
-        bottom_10[['Stock', 'Performance']]
-        .style
-        .format({'Performance': '{:.2f}%'})
-        .background_gradient(cmap='Reds')
-        .set_properties(**{'text-align': 'left'})
+        bottom_10[['Stock', 'Performance']],
+        column_config={'Performance': st.column_config.NumberColumn(format='%.2f%%')},
+        hide_index=True
     )
 
 selected_stock = st.sidebar.selectbox("Select a stock", list(stocks.keys()))
@@ -216,9 +243,8 @@ analysis_period = periods[selected_period]
 
 # Fetch stock data
 try:
-    stock = yf.Ticker(stock_symbol)
     # Use period parameter instead of days
-    hist = stock.history(period=analysis_period)
+    hist = get_ticker_history(stock_symbol, analysis_period)
     
     if hist.empty:
         st.error(f"No historical data available for {selected_stock}")
@@ -227,7 +253,7 @@ try:
     # Display basic stock info
     st.subheader(f"{selected_stock} ({stock_symbol})")
 
-    info = stock.info
+    info = get_ticker_info(stock_symbol)
     if info:
         col1, col2 = st.columns(2)
         with col1:
@@ -241,21 +267,21 @@ try:
 
     # Price chart
     st.subheader("Price History")
-    fig_price = px.line(hist, y='Close', title=f'{selected_stock} Price Movement')
+    fig_price = px.line(hist[['Close']], y='Close', title=f'{selected_stock} Price Movement')
     fig_price.update_layout(yaxis_title="Price", xaxis_title="Date")
     st.plotly_chart(fig_price)
 
     # Volume chart
     st.subheader("Volume Analysis")
-    fig_volume = px.bar(hist, y='Volume', title=f'{selected_stock} Trading Volume')
+    fig_volume = px.bar(hist[['Volume']], y='Volume', title=f'{selected_stock} Trading Volume')
     fig_volume.update_layout(yaxis_title="Volume", xaxis_title="Date")
     st.plotly_chart(fig_volume)
 
     # Moving Average Analysis
     st.subheader("Moving Averages")
     ma_period = st.slider("Select moving average period (days)", 5, 50, 20)
-    hist['MA'] = hist['Close'].rolling(window=ma_period).mean()
-    fig_ma = px.line(hist, y=['Close', 'MA'], title=f'{selected_stock} {ma_period}-Day Moving Average')
+    hist['MA'] = indicators.moving_average(hist['Close'].to_numpy(), ma_period)
+    fig_ma = px.line(hist[['Close', 'MA']], y=['Close', 'MA'], title=f'{selected_stock} {ma_period}-Day Moving Average')
     fig_ma.update_layout(yaxis_title="Price", xaxis_title="Date")
     st.plotly_chart(fig_ma)
 
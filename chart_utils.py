@@ -0,0 +1,55 @@
+import numpy as np
+
+# Upper bound on points sent to the browser per line trace
+MAX_CHART_POINTS = 2000
+
+def lttb_indices(y, n_out=MAX_CHART_POINTS, x=None):
+    """Positions kept by Largest-Triangle-Three-Buckets downsampling"""
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    y = np.asarray(y, dtype=float)
+    x = np.arange(n, dtype=float) if x is None else np.asarray(x, dtype=float)
+
+    # First and last points are always kept; the rest is split into n_out - 2 buckets
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    keep = np.empty(n_out, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        # Third triangle vertex is the mean of the next bucket (the last point for the final bucket)
+        if i < n_out - 3:
+            next_x = x[end:edges[i + 2]].mean()
+            next_y = y[end:edges[i + 2]].mean()
+        else:
+            next_x, next_y = x[-1], y[-1]
+        # Keep the point forming the largest triangle with the previous pick and that mean
+        area = np.abs((x[a] - next_x) * (y[start:end] - y[a]) - (x[a] - x[start:end]) * (next_y - y[a]))
+        a = start + int(np.argmax(area))
+        keep[i + 1] = a
+    return keep
+
+def bucket_starts(n, n_out=MAX_CHART_POINTS):
+    """Start positions of at most n_out runs of consecutive bars covering all n bars"""
+    step = max(1, -(-n // n_out))
+    return np.arange(0, n, step)
+
+def aggregate_ohlcv(starts, opens, highs, lows, closes, volumes):
+    """One bar per bucket: first open, max high, min low, last close, summed volume"""
+    ends = np.append(starts[1:], len(closes)) - 1
+    return (
+        opens[starts],
+        np.fmax.reduceat(highs, starts),
+        np.fmin.reduceat(lows, starts),
+        closes[ends],
+        np.add.reduceat(volumes, starts),
+    )
+
+def epoch_ms(index):
+    """Wall-clock timestamps of a DatetimeIndex as int64 milliseconds for a type='date' axis"""
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index.to_numpy().astype('datetime64[ms]').astype(np.int64)
@@ -1,9 +1,42 @@
 from pymongo import MongoClient
 from datetime import datetime, timedelta
 import pandas as pd
+import yfinance as yf
 import os
 import time
 
+try:
+    import streamlit as st
+    cache_resource = st.cache_resource
+except ImportError:
+    # Allow db_utils to be used outside of Streamlit (e.g. background updaters)
+    def cache_resource(func):
+        return func
+
+# Every index the queries below use, declared once. Each one is maintained on
+# every insert_many, so single-field indexes already covered as the prefix of a
+# compound one are left out
+HISTORY_INDEXES = [
+    [('ticker', 1), ('timestamp', -1)],  # per-ticker history, newest first
+    [('timestamp', 1), ('percent_change', 1)],  # performer range scans
+    [('period', 1)],  # per-period deletes
+]
+# Older single-field indexes made redundant by the compound ones
+REDUNDANT_INDEXES = ['ticker_1', 'timestamp_1']
+
+def create_indexes(db):
+    collection = db.stock_performance_history
+    existing = collection.index_information()
+    for name in REDUNDANT_INDEXES:
+        if name in existing:
+            collection.drop_index(name)
+    # create_index is a no-op when the index already exists
+    for keys in HISTORY_INDEXES:
+        collection.create_index(keys)
+    db.daily_performers.create_index([('date', 1), ('type', 1)])
+
+# Cached so every rerun and session shares one client and its connection pool
+@cache_resource
 def get_database_connection():
     try:
         # MongoDB connection settings with timeout
@@ -17,6 +50,9 @@ def get_database_connection():
         client.server_info()
         
         db = client['stocktracker']
+        
+        create_indexes(db)
+        
         return db, db.stock_performance_history
     except Exception as e:
         raise Exception(f"Failed to connect to MongoDB: {str(e)}. Make sure MongoDB is running.")
@@ -26,18 +62,16 @@ def save_stock_data(collection, df, period):
         # Clear previous data for this period
         collection.delete_many({'period': period})
         
-        # Save new data
-        records = []
-        for _, row in df.iterrows():
-            record = {
-                'ticker': row['Ticker'],
-                'current_price': float(row['Current Price']),
-                'percent_change': float(row['Percent Change']),
-                'volume': float(row['Volume']),
-                'timestamp': datetime.now(),
-                'period': period
-            }
-            records.append(record)
+        # Save new data; columns are built from typed arrays and the
+        # timestamp/period broadcast, so no per-record Python loop
+        records = pd.DataFrame({
+            'ticker': df['Ticker'].to_numpy(),
+            'current_price': df['Current Price'].to_numpy(dtype=float),
+            'percent_change': df['Percent Change'].to_numpy(dtype=float),
+            'volume': df['Volume'].to_numpy(dtype=float),
+            'timestamp': datetime.now(),
+            'period': period
+        }).to_dict('records')
         
         if records:
             collection.insert_many(records)
@@ -45,66 +79,55 @@ def save_stock_data(collection, df, period):
     except Exception as e:
         return False, f'Failed to save: {str(e)}'
 
-def get_top_performers_history(db, days=7, limit=10):
+def _get_performers_history(db, days, limit, sort_direction):
     collection = db.stock_performance_history
     end_date = datetime.now()
     start_date = end_date - timedelta(days=days)
     
-    # Get historical data for the specified period
-    historical_data = list(collection.find({
-        'timestamp': {
-            '$gte': start_date,
-            '$lte': end_date
-        }
-    }))
-    
-    if historical_data:
-        df = pd.DataFrame(historical_data)
-        if '_id' in df.columns:
-            df = df.drop('_id', axis=1)
-        
+    # Aggregate on the server so only `limit` documents come back over the wire
+    historical_data = list(collection.aggregate([
+        {'$match': {
+            'timestamp': {
+                '$gte': start_date,
+                '$lte': end_date
+            }
+        }},
+        # Sort by time first so $last picks the most recent price
+        {'$sort': {'timestamp': 1}},
         # Group by ticker and calculate average performance
-        df = df.groupby('ticker').agg({
-            'percent_change': 'mean',
-            'current_price': 'last',
-            'volume': 'mean'
-        }).reset_index()
-        
+        {'$group': {
+            '_id': '$ticker',
+            'percent_change': {'$avg': '$percent_change'},
+            'current_price': {'$last': '$current_price'},
+            'volume': {'$avg': '$volume'}
+        }},
         # Sort by percent_change and limit results
-        df = df.nlargest(limit, 'percent_change')
-        return df
-    return pd.DataFrame()
-
-def get_bottom_performers_history(db, days=7, limit=10):
-    collection = db.stock_performance_history
-    end_date = datetime.now()
-    start_date = end_date - timedelta(days=days)
-    
-    # Get historical data for the specified period
-    historical_data = list(collection.find({
-        'timestamp': {
-            '$gte': start_date,
-            '$lte': end_date
-        }
-    }))
+        {'$sort': {'percent_change': sort_direction}},
+        {'$limit': limit},
+        {'$project': {'_id': 0, 'ticker': '$_id', 'percent_change': 1, 'current_price': 1, 'volume': 1}}
+    ]))
     
     if historical_data:
-        df = pd.DataFrame(historical_data)
-        if '_id' in df.columns:
-            df = df.drop('_id', axis=1)
-        
-        # Group by ticker and calculate average performance
-        df = df.groupby('ticker').agg({
-            'percent_change': 'mean',
-            'current_price': 'last',
-            'volume': 'mean'
-        }).reset_index()
-        
-        # Sort by percent_change and limit results
-        df = df.nsmallest(limit, 'percent_change')
-        return df
+        return pd.DataFrame(historical_data, columns=['ticker', 'percent_change', 'current_price', 'volume'])
     return pd.DataFrame()
 
+def get_top_performers_history(db, days=7, limit=10):
+    return _get_performers_history(db, days, limit, sort_direction=-1)
+
+def get_bottom_performers_history(db, days=7, limit=10):
+    return _get_performers_history(db, days, limit, sort_direction=1)
+
+HISTORY_FIELDS = ['ticker', 'current_price', 'percent_change', 'volume', 'timestamp', 'period']
+
+def get_historical_performance(ticker):
+    db, collection = get_database_connection()
+    # Project only the stored fields the page shows, newest first
+    cursor = collection.find(
+        {'ticker': ticker},
+        {'_id': 0, **{field: 1 for field in HISTORY_FIELDS}}
+    ).sort('timestamp', -1)
+    return pd.DataFrame(list(cursor), columns=HISTORY_FIELDS)
+
 def save_daily_performers(db, top_stocks, bottom_stocks):
     collection = db.daily_performers
     today = datetime.now().date()
@@ -155,8 +178,9 @@ def get_daily_performers(db, days=7):
 def auto_update_data(db, collection, symbols, period):
     while True:
         try:
-            # Get current data
+            # Get current data; one timestamp for the whole batch
             data = []
+            timestamp = datetime.now()
             for symbol in symbols:
                 stock = yf.Ticker(symbol)
                 hist = stock.history(period=period)
@@ -171,7 +195,7 @@ def auto_update_data(db, collection, symbols, period):
                         'current_price': round(float(current_price), 2),
                         'percent_change': round(float(percent_change), 2),
                         'volume': float(volume),
-                        'timestamp': datetime.now(),
+                        'timestamp': timestamp,
                         'period': period
                     })
             
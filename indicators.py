@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+
+def moving_average(close, window):
+    """Simple moving average from one cumulative sum, NaN-padded like rolling(window).mean()"""
+    close = np.asarray(close, dtype=np.float64)
+    ma = np.full(len(close), np.nan)
+    if len(close) >= window:
+        csum = np.cumsum(np.insert(close, 0, 0.0))
+        ma[window - 1:] = (csum[window:] - csum[:-window]) / window
+    return ma
+
+def moving_averages(close, periods):
+    """Simple moving averages for every period the series is long enough for"""
+    return {
+        period: moving_average(close, period)
+        for period in periods
+        if len(close) >= period
+    }
+
+def _wilder_mean(values, window):
+    """Wilder's smoothing: an SMA seed over the first window, then avg = (avg*(n-1) + x)/n"""
+    out = np.full(len(values), np.nan)
+    if len(values) > window:
+        seeded = values[window:].copy()
+        seeded[0] = values[1:window + 1].mean()
+        # The recurrence is exactly an adjust=False EWM with alpha=1/n, run in compiled code
+        out[window:] = pd.Series(seeded).ewm(alpha=1 / window, adjust=False).mean().to_numpy()
+    return out
+
+def rsi(close, window=14):
+    """Relative Strength Index with Wilder's smoothing"""
+    delta = np.diff(np.asarray(close, dtype=np.float64), prepend=np.nan)
+    avg_gain = _wilder_mean(np.maximum(delta, 0), window)
+    avg_loss = _wilder_mean(np.maximum(-delta, 0), window)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return 100 - (100 / (1 + avg_gain / avg_loss))
+
+def macd(close, fast=12, slow=26, signal=9):
+    """MACD line, signal line and histogram"""
+    # One Series wrapper over the raw array; everything after the EWMs is plain array math
+    close = pd.Series(np.asarray(close, dtype=np.float64))
+    macd_line = (close.ewm(span=fast, adjust=False).mean().to_numpy()
+                 - close.ewm(span=slow, adjust=False).mean().to_numpy())
+    signal_line = pd.Series(macd_line).ewm(span=signal, adjust=False).mean().to_numpy()
+    return macd_line, signal_line, macd_line - signal_line
+
+def bollinger_bands(close, window=20, num_std=2):
+    """Middle, upper and lower bands plus the normalized band width"""
+    close = np.asarray(close, dtype=np.float64)
+    mid = np.full(len(close), np.nan)
+    std = np.full(len(close), np.nan)
+    if len(close) >= window:
+        # Rolling sum and sum of squares from two cumulative sums: one O(N) pass for
+        # both moments. Centering first keeps the variance subtraction well conditioned
+        centered = close - close.mean()
+        csum = np.cumsum(np.insert(centered, 0, 0.0))
+        csum_sq = np.cumsum(np.insert(centered * centered, 0, 0.0))
+        win_sum = csum[window:] - csum[:-window]
+        win_sum_sq = csum_sq[window:] - csum_sq[:-window]
+        mid[window - 1:] = win_sum / window + close.mean()
+        # Sample variance (ddof=1), matching rolling(window).std()
+        var = (win_sum_sq - win_sum * win_sum / window) / (window - 1)
+        std[window - 1:] = np.sqrt(np.maximum(var, 0))
+    upper = mid + std * num_std
+    lower = mid - std * num_std
+    return mid, upper, lower, (upper - lower) / mid
@@ -2,6 +2,7 @@
 import os
 from pymongo import MongoClient
 from dotenv import load_dotenv
+import db_utils
 
 # Load environment variables
 load_dotenv()
@@ -10,22 +11,28 @@ load_dotenv()
 MONGODB_URL = os.environ.get('MONGODB_URL', 'mongodb://localhost:27017')
 DB_NAME = os.environ.get('DB_NAME', 'stocktracker')
 
-def init_db():
+# Shared client; MongoClient is lazy and keeps its own connection pool
+_CLIENT = MongoClient(MONGODB_URL, maxPoolSize=20, minPoolSize=2)
+
+def init_db(reset=False):
     """Initialize the MongoDB database with required collections"""
-    client = MongoClient(MONGODB_URL)
-    db = client[DB_NAME]
+    db = _CLIENT[DB_NAME]
+    exists = 'stock_performance_history' in db.list_collection_names()
     
-    # Drop existing collection if it exists
-    if 'stock_performance_history' in db.list_collection_names():
+    # Only drop existing history when explicitly asked to
+    if exists and reset:
         db.drop_collection('stock_performance_history')
+        exists = False
     
     # Create collection
-    collection = db.create_collection('stock_performance_history')
+    if not exists:
+        db.create_collection('stock_performance_history')
     
-    # Create index on ticker field
-    collection.create_index('ticker')
+    # Indexes are declared once in db_utils
+    db_utils.create_indexes(db)
     
     print(f"MongoDB database '{DB_NAME}' initialized successfully!")
 
 if __name__ == "__main__":
-    init_db()
+    # Set RESET_DB=1 to wipe existing history
+    init_db(reset=os.environ.get('RESET_DB') == '1')
@@ -1,9 +1,11 @@
 import streamlit as st
-import yfinance as yf
 import pandas as pd
+import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
-from datetime import datetime, timedelta
+import ui_utils
+import yf_utils
+from chart_utils import lttb_indices
 
 # Set page configuration
 st.set_page_config(
@@ -13,90 +15,7 @@ st.set_page_config(
 )
 
 # Custom CSS for better styling
-st.markdown("""
-<style>
-    /* Main page styling */
-    .main .block-container {
-        padding-top: 2rem;
-        padding-bottom: 2rem;
-    }
-    
-    /* Header styling */
-    h1, h2, h3 {
-        color: #1E88E5;
-        font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-    }
-    
-    h1 {
-        background: linear-gradient(to right, #1E88E5, #42A5F5);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        font-size: 3rem;
-        font-weight: 800;
-        margin-bottom: 1.5rem;
-    }
-    
-    /* Stock cards styling */
-    div[data-testid="stHorizontalBlock"] {
-        background-color: #f8f9fa;
-        border-radius: 10px;
-        padding: 1rem;
-        margin-bottom: 1rem;
-        box-shadow: 0 2px 5px rgba(0,0,0,0.05);
-    }
-    
-    /* Metric styling */
-    div[data-testid="stMetricValue"] {
-        font-size: 1.3rem;
-        font-weight: bold;
-    }
-    
-    div[data-testid="stMetricDelta"] {
-        font-size: 1rem;
-    }
-    
-    /* Tab styling */
-    .stTabs [data-baseweb="tab-list"] {
-        gap: 2rem;
-    }
-    
-    .stTabs [data-baseweb="tab"] {
-        height: 3rem;
-        white-space: pre-wrap;
-        border-radius: 4px 4px 0 0;
-        padding: 0 1rem;
-        font-size: 1rem;
-    }
-    
-    /* Active tab styling */
-    .stTabs [aria-selected="true"] {
-        background-color: #e6f3ff !important;
-        font-weight: bold;
-    }
-    
-    /* Divider styling */
-    hr {
-        margin-top: 2rem;
-        margin-bottom: 2rem;
-        border: 0;
-        height: 1px;
-        background-image: linear-gradient(to right, rgba(0, 0, 0, 0), rgba(0, 0, 0, 0.1), rgba(0, 0, 0, 0));
-    }
-    
-    /* Footer styling */
-    footer {
-        margin-top: 3rem;
-        padding-top: 1rem;
-        border-top: 1px solid #f0f2f6;
-        text-align: center;
-        font-size: 0.8rem;
-        color: #6c757d;
-    }
-</style>
-""", unsafe_allow_html=True)
-import time
-
-# This is already handled by the earlier set_page_config declaration
+ui_utils.inject_css("market_overview.css")
 
 # Page title
 st.title("🌎 Market Overview")
@@ -120,47 +39,89 @@ period_options = {
 selected_period = st.sidebar.selectbox(
     "Select Time Period", 
     list(period_options.keys()),
-    index=3
+    index=3,
+    key="period"
 )
 
 # Data interval
-intervals = ["1d", "1wk", "1mo"]
-interval_names = ["Daily", "Weekly", "Monthly"]
+intervals = {
+    "Daily": "1d",
+    "Weekly": "1wk",
+    "Monthly": "1mo"
+}
+
 selected_interval = st.sidebar.selectbox(
     "Select Data Interval",
-    interval_names,
-    index=0
+    list(intervals.keys()),
+    index=0,
+    key="interval"
 )
-interval = intervals[interval_names.index(selected_interval)]
+interval = intervals[selected_interval]
+
+# List of major market indices
+INDICES = {
+    "S&P 500": "^GSPC",
+    "Dow Jones": "^DJI",
+    "NASDAQ": "^IXIC",
+    "Russell 2000": "^RUT",
+    "VIX Volatility": "^VIX",
+    "FTSE 100": "^FTSE",
+    "Nikkei 225": "^N225",
+    "Hang Seng": "^HSI",
+    "DAX": "^GDAXI"
+}
 
-# Manual refresh button
-if st.sidebar.button("Refresh Data"):
-    st.rerun()
+# Longest selectable period; every shorter one is sliced from it in memory
+MAX_PERIOD = "5y"
+PERIOD_OFFSETS = {
+    "1d": pd.DateOffset(days=1),
+    "5d": pd.DateOffset(days=5),
+    "1mo": pd.DateOffset(months=1),
+    "3mo": pd.DateOffset(months=3),
+    "6mo": pd.DateOffset(months=6),
+    "1y": pd.DateOffset(years=1),
+    "2y": pd.DateOffset(years=2),
+    "5y": pd.DateOffset(years=5)
+}
+
+# Full history for every index, fetched once per interval
+@st.cache_data(ttl=3600)  # Cache for 1 hour
+def get_indices_history(interval, _refresh=False):
+    # One batched request for every index, served from the on-disk cache when fresh
+    all_df = yf_utils.download(INDICES.values(), refresh=_refresh, ttl=3600, period=MAX_PERIOD, interval=interval,
+                               group_by='ticker', auto_adjust=True, actions=False)
+    
+    # Daily returns for every index in one pass over the Close matrix. Forward
+    # filling bridges other markets' dates so each return is taken against the
+    # index's own previous close, then those bridged rows are masked out again
+    returns = pd.DataFrame()
+    if not all_df.empty:
+        close = all_df.xs('Close', level=1, axis=1)
+        returns = close.ffill().pct_change(fill_method=None).where(close.notna()) * 100
+    
+    return all_df, returns
 
 # Get major market indices data
 @st.cache_data(ttl=3600)  # Cache for 1 hour
-def get_indices_data(period, interval):
-    # List of major market indices
-    indices = {
-        "S&P 500": "^GSPC",
-        "Dow Jones": "^DJI",
-        "NASDAQ": "^IXIC",
-        "Russell 2000": "^RUT",
-        "VIX Volatility": "^VIX",
-        "FTSE 100": "^FTSE",
-        "Nikkei 225": "^N225",
-        "Hang Seng": "^HSI",
-        "DAX": "^GDAXI"
-    }
+def get_indices_data(period, interval, _refresh=False):
+    all_df, returns = get_indices_history(interval, _refresh=_refresh)
+    if all_df.empty:
+        return {}
     
-    # Get data for all indices
     data = {}
-    for name, symbol in indices.items():
+    fetched = all_df.columns.get_level_values(0)
+    for name, symbol in INDICES.items():
+        # Indices Yahoo returned nothing for are skipped, as before batching
+        if symbol not in fetched:
+            continue
         try:
-            df = yf.download(symbol, period=period, interval=interval)
+            # Indices trade on different calendars, so drop the other markets' dates
+            df = all_df[symbol].dropna(how='all')
+            # Keep only the bars inside the selected period
             if not df.empty:
-                # Calculate daily returns
-                df['Daily Return'] = df['Close'].pct_change() * 100
+                df = df[df.index > df.index[-1] - PERIOD_OFFSETS[period]].copy()
+            if not df.empty:
+                df['Daily Return'] = returns[symbol].reindex(df.index)
                 data[name] = {
                     'symbol': symbol,
                     'data': df,
@@ -175,210 +136,273 @@ def get_indices_data(period, interval):
     
     return data
 
-# Global indices data
-indices_data = get_indices_data(period_options[selected_period], interval)
-
-# Display indices overview
-st.header("Major Market Indices")
-
-if indices_data:
-    # Create a heatmap of market performance
-    heatmap_data = []
+# Derived tables are cached on the same key as the raw data, so widget
+# reruns only redraw the charts instead of recomputing them. The loaded data is
+# passed in (unhashed) so get_indices_data, and its st.error replays, run once per render
+@st.cache_data(ttl=3600)
+def compute_summaries(period, interval, _indices_data):
+    indices_data = _indices_data
+    
+    # Heatmap / summary table, one row per index with float64 columns
+    heatmap_df = pd.DataFrame({
+        'Index': pd.array(list(indices_data.keys()), dtype='string[pyarrow]'),
+        'Current Value': np.array([data['current'] for data in indices_data.values()], dtype=float),
+        'Change': np.array([data['change'] for data in indices_data.values()], dtype=float),
+        'Percent Change': np.array([data['percent_change'] for data in indices_data.values()], dtype=float)
+    })
+    
+    # Normalize every index to a starting value of 100 and stack them into long form
+    normalized = {}
     for name, data in indices_data.items():
-        heatmap_data.append({
-            'Index': name,
-            'Current Value': data['current'],
-            'Change': data['change'],
-            'Percent Change': data['percent_change']
-        })
+        close = data['data']['Close']
+        # Downsample each series before stacking to keep the chart payload small
+        close = close.iloc[lttb_indices(close.to_numpy())]
+        normalized[name] = (close / close.iloc[0]) * 100
     
-    heatmap_df = pd.DataFrame(heatmap_data)
+    comparison_df = pd.DataFrame()
+    if normalized:
+        comparison_df = (
+            pd.concat(normalized, names=['Index', 'Date'])
+            .rename('Normalized Value')
+            .reset_index()
+            .astype({'Index': 'string[pyarrow]'})
+        )
     
-    # Create heatmap with plotly
-    fig_heatmap = px.imshow(
-        heatmap_df.set_index('Index')[['Percent Change']].T,
+    # Align every index's daily returns as columns and reduce them in one pass
+    volatility_df = pd.DataFrame()
+    if indices_data:
+        returns = pd.concat(
+            {name: data['data']['Daily Return'] for name, data in indices_data.items()},
+            axis=1
+        )
+        volatility_df = (
+            returns.agg(['std', 'mean', 'max', 'min']).T
+            .rename(columns={
+                'std': 'Volatility (%)',
+                'mean': 'Avg Daily Change (%)',
+                'max': 'Max Daily Gain (%)',
+                'min': 'Max Daily Loss (%)'
+            })
+            .rename_axis('Index')
+            .reset_index()
+            .astype({'Index': 'string[pyarrow]'})
+        )
+    
+    # Index names are Arrow-backed strings so the tables convert to Arrow without
+    # copying object columns; the float64 columns already convert zero-copy
+    return heatmap_df, comparison_df, volatility_df
+
+# Figure builders keep the built figure objects in st.cache_resource, keyed on
+# (period, interval) like compute_summaries, so reruns reuse them without hashing
+# the summary frames or unpickling figures
+@st.cache_resource(ttl=3600)
+def build_heatmap_fig(period, interval, _heatmap_df):
+    heatmap_df = _heatmap_df
+    fig = px.imshow(
+        heatmap_df['Percent Change'].to_numpy()[np.newaxis, :],
+        x=heatmap_df['Index'].tolist(),
+        y=['Percent Change'],
         color_continuous_scale=['red', 'white', 'green'],
         labels=dict(x="Index", y="Metric", color="Value"),
         title="Global Market Performance Heatmap"
     )
-    fig_heatmap.update_layout(height=200)
-    st.plotly_chart(fig_heatmap, use_container_width=True)
+    fig.update_layout(height=200)
+    return fig
+
+@st.cache_resource(ttl=3600)
+def build_comparison_fig(period, interval, period_label, _comparison_df):
+    fig = px.line(
+        _comparison_df,
+        x='Date',
+        y='Normalized Value',
+        color='Index',
+        title=f"Normalized Performance Comparison (Starting Value = 100) - {period_label}",
+        labels={'Normalized Value': 'Performance (Base 100)'},
+        render_mode='webgl'
+    )
+    fig.update_layout(height=600)
+    return fig
+
+@st.cache_resource(ttl=3600)
+def build_volatility_fig(period, interval, period_label, _volatility_df):
+    volatility_df = _volatility_df
+    # Built with go.Bar from sorted arrays; plotly.js maps the colorscale itself
+    order = volatility_df['Volatility (%)'].to_numpy().argsort()
+    volatility = volatility_df['Volatility (%)'].to_numpy()[order]
+    fig = go.Figure(go.Bar(
+        x=volatility_df['Index'].to_numpy()[order],
+        y=volatility,
+        marker=dict(
+            color=volatility,
+            colorscale=[[0, 'green'], [0.5, 'yellow'], [1, 'red']],
+            colorbar=dict(title='Volatility (%)')
+        )
+    ))
+    fig.update_layout(
+        title=f"Market Volatility - {period_label}",
+        xaxis_title='Index',
+        yaxis_title='Volatility (%)',
+        height=500
+    )
+    return fig
+
+# Rendered as a fragment so the refresh button and index selector
+# rerun this section only, not the whole page
+@st.fragment
+def display_indices_data():
+    # Manual refresh button; inside the fragment it reruns only this section.
+    # Figures are keyed on (period, interval) rather than content, so they are dropped too
+    refresh = st.button("Refresh Data")
+    if refresh:
+        get_indices_history.clear()
+        get_indices_data.clear()
+        compute_summaries.clear()
+        build_heatmap_fig.clear()
+        build_comparison_fig.clear()
+        build_volatility_fig.clear()
+
+    # Global indices data. The title and sidebar above are already on screen,
+    # so only this section waits on the download
+    with st.spinner("Loading market data..."):
+        indices_data = get_indices_data(period_options[selected_period], interval, _refresh=refresh)
+        heatmap_df, comparison_df, volatility_df = compute_summaries(period_options[selected_period], interval, indices_data)
+
+    # Display indices overview
+    st.header("Major Market Indices")
+
+    if indices_data:
+        # Create heatmap with plotly
+        st.plotly_chart(build_heatmap_fig(period_options[selected_period], interval, heatmap_df), use_container_width=True)
     
-    # Create a matrix of metrics
-    col1, col2, col3 = st.columns(3)
+        # Create a matrix of metrics
+        col1, col2, col3 = st.columns(3)
     
-    for i, (name, data) in enumerate(indices_data.items()):
-        # Determine which column to use
-        col = [col1, col2, col3][i % 3]
-        
-        # Determine color based on change
-        delta_color = "normal" if float(data['change'].iloc[0]) >= 0 else "inverse"
+        # Read the cached summary columns once as plain Python floats
+        summary_rows = zip(
+            heatmap_df['Index'],
+            heatmap_df['Current Value'].tolist(),
+            heatmap_df['Change'].tolist(),
+            heatmap_df['Percent Change'].tolist()
+        )
+        for i, (name, current_val, change_val, percent_val) in enumerate(summary_rows):
+            # Determine which column to use
+            col = [col1, col2, col3][i % 3]
         
-        # Display metric
-        with col:
-            current_val = float(data['current'])
-            change_val = float(data['change'])
-            percent_val = float(data['percent_change'])
-            
-            delta_color = "normal" if change_val >= 0 else "inverse"
-            st.metric(
-                label=name,
-                value=f"{current_val:.2f}",
-                delta=f"{change_val:.2f} ({percent_val:.2f}%)",
-                delta_color=delta_color
-            )
+            # Display metric
+            with col:
+                delta_color = "normal" if change_val >= 0 else "inverse"
+                st.metric(
+                    label=name,
+                    value=f"{current_val:.2f}",
+                    delta=f"{change_val:.2f} ({percent_val:.2f}%)",
+                    delta_color=delta_color
+                )
     
-    # Create tabs for different visualizations
-    tab1, tab2, tab3 = st.tabs(["Price Charts", "Performance Comparison", "Volatility Analysis"])
+        # Create tabs for different visualizations
+        tab1, tab2, tab3 = st.tabs(["Price Charts", "Performance Comparison", "Volatility Analysis"])
     
-    with tab1:
-        # Price charts for each index
-        selected_index = st.selectbox(
-            "Select Market Index to View",
-            list(indices_data.keys())
-        )
+        with tab1:
+            # Price charts for each index
+            selected_index = st.selectbox(
+                "Select Market Index to View",
+                list(indices_data.keys())
+            )
         
-        if selected_index in indices_data:
-            index_data = indices_data[selected_index]
-            df = index_data['data']
+            if selected_index in indices_data:
+                index_data = indices_data[selected_index]
+                df = index_data['data']
             
-            # Create chart
-            fig = go.Figure()
+                # Create chart
+                fig = go.Figure()
             
-            # Add price line
-            fig.add_trace(go.Scatter(
-                x=df.index,
-                y=df['Close'],
-                mode='lines',
-                name='Close Price',
-                line=dict(color='royalblue', width=2)
-            ))
+                # Add price line, downsampled so long periods stay light in the browser
+                price = df['Close'].iloc[lttb_indices(df['Close'].to_numpy())]
+                fig.add_trace(go.Scattergl(
+                    x=price.index,
+                    y=price,
+                    mode='lines',
+                    name='Close Price',
+                    line=dict(color='royalblue', width=2)
+                ))
             
-            # Add volume as bar chart
-            fig.add_trace(go.Bar(
-                x=df.index,
-                y=df['Volume'],
-                name='Volume',
-                yaxis='y2',
-                marker=dict(color='lightgray', opacity=0.5)
-            ))
+                # Add volume as bar chart; daily bars are binned by week to cut the bar count ~5x.
+                # Weekly bins are stamped at the week's start so the unified hover pairs
+                # them with that week's prices, not the following Sunday's
+                weekly = interval == '1d'
+                volume = df['Volume'].resample('W', label='left').sum() if weekly else df['Volume']
+                fig.add_trace(go.Bar(
+                    x=volume.index,
+                    y=volume,
+                    name='Weekly Volume' if weekly else 'Volume',
+                    yaxis='y2',
+                    marker=dict(color='lightgray', opacity=0.5)
+                ))
             
-            # Update layout
-            fig.update_layout(
-                title=f"{selected_index} ({index_data['symbol']}) - {selected_period}",
-                xaxis_title='Date',
-                yaxis_title='Price',
-                hovermode='x unified',
-                yaxis2=dict(
-                    title='Volume',
-                    overlaying='y',
-                    side='right',
-                    showgrid=False
-                ),
-                height=600
-            )
+                # Update layout
+                fig.update_layout(
+                    title=f"{selected_index} ({index_data['symbol']}) - {selected_period}",
+                    xaxis_title='Date',
+                    yaxis_title='Price',
+                    hovermode='x unified',
+                    yaxis2=dict(
+                        title='Volume',
+                        overlaying='y',
+                        side='right',
+                        showgrid=False
+                    ),
+                    height=600
+                )
             
-            st.plotly_chart(fig, use_container_width=True)
+                st.plotly_chart(fig, use_container_width=True)
             
-            # Display performance metrics
-            st.subheader(f"{selected_index} Performance Metrics")
-            metrics_col1, metrics_col2, metrics_col3, metrics_col4 = st.columns(4)
+                # Display performance metrics
+                st.subheader(f"{selected_index} Performance Metrics")
+                metrics_col1, metrics_col2, metrics_col3, metrics_col4 = st.columns(4)
             
-            with metrics_col1:
-                st.metric("High", f"{float(index_data['high']):.2f}")
-            with metrics_col2:
-                st.metric("Low", f"{float(index_data['low']):.2f}")
-            with metrics_col3:
-                st.metric("Current", f"{float(index_data['current']):.2f}")
-            with metrics_col4:
-                st.metric("Change %", f"{float(index_data['percent_change']):.2f}%")
+                with metrics_col1:
+                    st.metric("High", f"{float(index_data['high']):.2f}")
+                with metrics_col2:
+                    st.metric("Low", f"{float(index_data['low']):.2f}")
+                with metrics_col3:
+                    st.metric("Current", f"{float(index_data['current']):.2f}")
+                with metrics_col4:
+                    st.metric("Change %", f"{float(index_data['percent_change']):.2f}%")
 
-            # Display index data with proper formatting
-            if not df.empty:
-                col1, col2, col3 = st.columns(3)
-                with col1:
-                    st.metric("Open", f"{float(df['Open'].iloc[-1]):.2f}")
-                    st.metric("High", f"{float(df['High'].iloc[-1]):.2f}")
-                with col2:
-                    st.metric("Close", f"{float(df['Close'].iloc[-1]):.2f}")
-                    st.metric("Low", f"{float(df['Low'].iloc[-1]):.2f}")
-                with col3:
-                    st.metric("Volume", f"{float(df['Volume'].iloc[-1]):,.0f}")
-                    st.metric("Change %", f"{float(df['Daily Return'].iloc[-1]):.2f}%")
+                # Display index data with proper formatting
+                if not df.empty:
+                    col1, col2, col3 = st.columns(3)
+                    with col1:
+                        st.metric("Open", f"{float(df['Open'].iloc[-1]):.2f}")
+                        st.metric("High", f"{float(df['High'].iloc[-1]):.2f}")
+                    with col2:
+                        st.metric("Close", f"{float(df['Close'].iloc[-1]):.2f}")
+                        st.metric("Low", f"{float(df['Low'].iloc[-1]):.2f}")
+                    with col3:
+                        st.metric("Volume", f"{float(df['Volume'].iloc[-1]):,.0f}")
+                        st.metric("Change %", f"{float(df['Daily Return'].iloc[-1]):.2f}%")
     
-    with tab2:
-        # Performance comparison of all indices
-        st.subheader("Comparative Performance")
-        
-        # Prepare data for comparison
-        comparison_data = []
-        for name, data in indices_data.items():
-            df = data['data']
-            
-            # Normalize to starting value = 100
-            normalized_series = (df['Close'] / df['Close'].iloc[0]) * 100
-            
-            for date, value in zip(normalized_series.index, normalized_series.values):
-                comparison_data.append({
-                    'Date': date,
-                    'Index': name,
-                    'Normalized Value': value
-                })
+        with tab2:
+            # Performance comparison of all indices
+            st.subheader("Comparative Performance")
         
-        if comparison_data:
-            comparison_df = pd.DataFrame(comparison_data)
-            
-            # Create comparison chart
-            fig = px.line(
-                comparison_df,
-                x='Date',
-                y='Normalized Value',
-                color='Index',
-                title=f"Normalized Performance Comparison (Starting Value = 100) - {selected_period}",
-                labels={'Normalized Value': 'Performance (Base 100)'}
-            )
-            
-            fig.update_layout(height=600)
-            st.plotly_chart(fig, use_container_width=True)
+            if not comparison_df.empty:
+                # Create comparison chart
+                st.plotly_chart(build_comparison_fig(period_options[selected_period], interval, selected_period, comparison_df), use_container_width=True)
         
-    with tab3:
-        # Volatility analysis
-        st.subheader("Market Volatility Analysis")
+        with tab3:
+            # Volatility analysis
+            st.subheader("Market Volatility Analysis")
         
-        # Prepare volatility data
-        volatility_data = []
-        for name, data in indices_data.items():
-            df = data['data']
-            volatility = df['Daily Return'].std()
+            if not volatility_df.empty:
+                # Create volatility chart
+                st.plotly_chart(build_volatility_fig(period_options[selected_period], interval, selected_period, volatility_df), use_container_width=True)
             
-            volatility_data.append({
-                'Index': name,
-                'Volatility (%)': volatility,
-                'Avg Daily Change (%)': df['Daily Return'].mean(),
-                'Max Daily Gain (%)': df['Daily Return'].max(),
-                'Max Daily Loss (%)': df['Daily Return'].min()
-            })
-        
-        if volatility_data:
-            volatility_df = pd.DataFrame(volatility_data)
-            
-            # Create volatility chart
-            fig = px.bar(
-                volatility_df.sort_values('Volatility (%)'),
-                x='Index',
-                y='Volatility (%)',
-                title=f"Market Volatility - {selected_period}",
-                color='Volatility (%)',
-                color_continuous_scale=['green', 'yellow', 'red']
-            )
-            
-            fig.update_layout(height=500)
-            st.plotly_chart(fig, use_container_width=True)
-            
-            # Display volatility data table
-            st.dataframe(volatility_df, use_container_width=True)
-else:
-    st.warning("No market data available. Please check your connection or try a different time period.")
+                # Nine rows need no interactive grid; a static table is lighter
+                st.table(volatility_df.round(3))
+    else:
+        st.warning("No market data available. Please check your connection or try a different time period.")
+
+display_indices_data()
 
 # Show app information at the bottom
 st.markdown("---")
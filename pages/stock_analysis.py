@@ -1,12 +1,15 @@
 import streamlit as st
-import yfinance as yf
 import pandas as pd
 import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
 import db_utils
+import indicators
+import ui_utils
+from chart_utils import aggregate_ohlcv, bucket_starts, epoch_ms, lttb_indices
+import yf_utils
 
 # Set page configuration
 st.set_page_config(
@@ -16,121 +19,7 @@ st.set_page_config(
 )
 
 # Custom CSS for better styling
-st.markdown("""
-<style>
-    /* Main page styling */
-    .main .block-container {
-        padding-top: 2rem;
-        padding-bottom: 2rem;
-    }
-    
-    /* Header styling */
-    h1, h2, h3 {
-        color: #1E88E5;
-        font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-    }
-    
-    h1 {
-        background: linear-gradient(to right, #1E88E5, #42A5F5);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        font-size: 3rem;
-        font-weight: 800;
-        margin-bottom: 1.5rem;
-    }
-    
-    h2 {
-        font-size: 1.8rem;
-        padding-top: 1rem;
-        border-bottom: 2px solid #f0f2f6;
-        padding-bottom: 0.5rem;
-    }
-    
-    /* Stock cards styling */
-    div[data-testid="stHorizontalBlock"] {
-        background-color: #f8f9fa;
-        border-radius: 10px;
-        padding: 1rem;
-        margin-bottom: 1rem;
-        box-shadow: 0 2px 5px rgba(0,0,0,0.05);
-    }
-    
-    /* Metric styling */
-    div[data-testid="stMetricValue"] {
-        font-size: 1.3rem;
-        font-weight: bold;
-    }
-    
-    div[data-testid="stMetricDelta"] {
-        font-size: 1rem;
-    }
-    
-    /* Tab styling */
-    .stTabs [data-baseweb="tab-list"] {
-        gap: 2rem;
-    }
-    
-    .stTabs [data-baseweb="tab"] {
-        height: 3rem;
-        white-space: pre-wrap;
-        border-radius: 4px 4px 0 0;
-        padding: 0 1rem;
-        font-size: 1rem;
-    }
-    
-    /* Active tab styling */
-    .stTabs [aria-selected="true"] {
-        background-color: #e6f3ff !important;
-        font-weight: bold;
-    }
-    
-    /* Divider styling */
-    hr {
-        margin-top: 2rem;
-        margin-bottom: 2rem;
-        border: 0;
-        height: 1px;
-        background-image: linear-gradient(to right, rgba(0, 0, 0, 0), rgba(0, 0, 0, 0.1), rgba(0, 0, 0, 0));
-    }
-    
-    /* Chart containers */
-    div[data-testid="stVerticalBlock"] > div[style] {
-        background-color: #ffffff;
-        border-radius: 10px;
-        padding: 1rem;
-        box-shadow: 0 2px 5px rgba(0,0,0,0.05);
-        margin-bottom: 1rem;
-    }
-    
-    /* Footer styling */
-    footer {
-        margin-top: 3rem;
-        padding-top: 1rem;
-        border-top: 1px solid #f0f2f6;
-        text-align: center;
-        font-size: 0.8rem;
-        color: #6c757d;
-    }
-    
-    /* Dataframe styling */
-    .dataframe {
-        border-radius: 10px;
-        overflow: hidden;
-        border: 1px solid #e6e6e6;
-    }
-    
-    /* Make positive values green and negative values red */
-    .positive {
-        color: green !important;
-        font-weight: bold;
-    }
-    
-    .negative {
-        color: red !important;
-        font-weight: bold;
-    }
-</style>
-""", unsafe_allow_html=True)
+ui_utils.inject_css("stock_analysis.css")
 
 # This is already handled by the earlier set_page_config declaration
 
@@ -158,26 +47,586 @@ time_periods = {
 selected_period = st.sidebar.selectbox(
     "Select Time Period",
     list(time_periods.keys()),
-    index=3
+    index=3,
+    key="period"
 )
 
 # Data interval selector
-intervals = ["1d", "1wk", "1mo"]
-interval_names = ["Daily", "Weekly", "Monthly"]
+intervals = {
+    "Daily": "1d",
+    "Weekly": "1wk",
+    "Monthly": "1mo"
+}
+
 selected_interval = st.sidebar.selectbox(
     "Select Data Interval",
-    interval_names,
-    index=0
+    list(intervals.keys()),
+    index=0,
+    key="interval"
 )
-interval = intervals[interval_names.index(selected_interval)]
+interval = intervals[selected_interval]
+
+INFO_FIELDS = ('shortName', 'sector', 'industry', 'currentPrice', 'previousClose', 'marketCap', 'volume')
+
+# Yahoo lookups, cached so widget changes (MA selectors, tabs) don't refetch
+@st.cache_data(ttl=300, show_spinner=False)
+def get_ticker_info(symbol):
+    info = yf_utils.get_ticker(symbol).info
+    # Keep only the fields the page shows; st.cache_data unpickles the whole value on every hit
+    return {key: info[key] for key in INFO_FIELDS if key in info}
+
+@st.cache_data(ttl=300, show_spinner=False)
+def get_ticker_history(symbol, period, interval):
+    return yf_utils.history(symbol, period, interval, ttl=300)
+
+# Stored records only change when the database is updated, not with the period or interval.
+# Failures are returned rather than raised so they are cached too; otherwise every
+# rerun without MongoDB would wait out the connection timeout again
+@st.cache_data(ttl=300, show_spinner=False)
+def get_db_history(symbol):
+    try:
+        return db_utils.get_historical_performance(symbol), None
+    except Exception as e:
+        return None, str(e)
+
+MA_PERIODS = [5, 10, 20, 50, 200]
+
+# RSI trend bins; the first edge sits just above 30 so that exactly 30 is Oversold
+RSI_EDGES = np.array([np.nextafter(30, np.inf), 45, 55, 70])
+RSI_CATEGORIES = np.array(['Oversold', 'Bearish', 'Neutral', 'Bullish', 'Overbought'])
+
+# Points per line trace; a chart a few hundred pixels wide cannot resolve more
+LINE_CHART_POINTS = 600
+
+# Every indicator is computed once per (ticker, period, interval) and kept
+# as NumPy arrays; the tabs only plot them
+@st.cache_data(ttl=300, show_spinner=False)
+def get_indicators(symbol, period, interval):
+    close = get_ticker_history(symbol, period, interval)['Close']
+    ind = {f'MA{p}': ma for p, ma in indicators.moving_averages(close, MA_PERIODS).items()}
+    ind['RSI'] = indicators.rsi(close)
+    ind['MACD'], ind['Signal'], ind['Histogram'] = indicators.macd(close)
+    ind['BBMid'], ind['Upper'], ind['Lower'], ind['BBWidth'] = indicators.bollinger_bands(close)
+    ind['Daily Return'] = close.pct_change().to_numpy() * 100
+    return ind
+
+# Figures below go through st.cache_resource: the built go.Figure object is kept
+# as-is, so a rerun with the same inputs skips Plotly's trace and layout validation
+# (and the unpickling st.cache_data would do). st.plotly_chart never mutates them
+
+# Candlestick with a volume row colored by up/down bars
+@st.cache_resource(ttl=300, show_spinner=False)
+def build_price_volume_fig(symbol, period, interval, title):
+    hist = get_ticker_history(symbol, period, interval)
+    # Long periods are merged into at most MAX_CHART_POINTS bars, each covering a
+    # run of consecutive bars, so no high, low or volume is dropped
+    starts = bucket_starts(len(hist))
+    opens, highs, lows, closes, volumes = aggregate_ohlcv(
+        starts,
+        hist['Open'].to_numpy(),
+        hist['High'].to_numpy(),
+        hist['Low'].to_numpy(),
+        hist['Close'].to_numpy(),
+        hist['Volume'].to_numpy()
+    )
+    # Plotly sends typed NumPy arrays as packed binary, so epoch-ms ints and float32
+    # prices are half the size of ISO date strings and float64
+    dates = epoch_ms(hist.index[starts])
+    opens, highs, lows, closes = (a.astype(np.float32) for a in (opens, highs, lows, closes))
+    
+    fig = make_subplots(rows=2, cols=1, shared_xaxes=True, 
+                        vertical_spacing=0.03, 
+                        row_heights=[0.7, 0.3])
+    
+    # Add candlestick
+    fig.add_trace(go.Candlestick(
+        x=dates,
+        open=opens,
+        high=highs,
+        low=lows,
+        close=closes,
+        name="Price"
+    ), row=1, col=1)
+    
+    # Add volume
+    fig.add_trace(go.Bar(
+        x=dates,
+        y=volumes,
+        marker_color=np.where(closes >= opens, 'green', 'red'),
+        name="Volume"
+    ), row=2, col=1)
+    
+    fig.update_layout(
+        title=title,
+        yaxis_title="Price ($)",
+        xaxis_rangeslider_visible=False,
+        height=600,
+        hovermode="x unified",
+        # Keep the user's zoom and pan across reruns until the data selection changes
+        uirevision=f"{symbol}-{period}-{interval}"
+    )
+    
+    fig.update_xaxes(type="date")
+    fig.update_xaxes(title_text="Date", row=2, col=1)
+    fig.update_yaxes(title_text="Volume", row=2, col=1)
+    return fig
+
+def _line_series(symbol, period, interval):
+    """Dates, closes and the LTTB-selected positions used by every line trace"""
+    hist = get_ticker_history(symbol, period, interval)
+    index = hist.index
+    dates = (index.tz_localize(None) if index.tz is not None else index).to_numpy()
+    closes = hist['Close'].to_numpy()
+    # Line traces are thinned to the same LTTB-selected bars of the price
+    # series; candlesticks and volume bars are aggregated instead (aggregate_ohlcv)
+    return dates, closes, lttb_indices(closes, LINE_CHART_POINTS)
+
+@st.cache_resource(ttl=300, show_spinner=False)
+def build_ma_fig(symbol, period, interval):
+    ind = get_indicators(symbol, period, interval)
+    dates, closes, keep = _line_series(symbol, period, interval)
+    line_x = dates[keep]
+    
+    fig = go.Figure()
+    
+    # Add price
+    fig.add_trace(go.Scattergl(
+        x=line_x,
+        y=closes[keep],
+        mode='lines',
+        name='Price',
+        line=dict(color='black', width=2)
+    ))
+    
+    # Add moving averages
+    colors = ['blue', 'green', 'red', 'purple', 'orange']
+    for i, ma_period in enumerate(MA_PERIODS):
+        if f'MA{ma_period}' in ind:
+            fig.add_trace(go.Scattergl(
+                x=line_x,
+                y=ind[f'MA{ma_period}'][keep],
+                mode='lines',
+                name=f'{ma_period}-day MA',
+                line=dict(color=colors[i % len(colors)])
+            ))
+    
+    fig.update_layout(
+        title="Moving Averages",
+        xaxis_title="Date",
+        yaxis_title="Price",
+        height=500
+    )
+    return fig
+
+@st.cache_resource(ttl=300, show_spinner=False)
+def build_crossover_fig(symbol, period, interval, ma_short, ma_long):
+    ind = get_indicators(symbol, period, interval)
+    dates, closes, keep = _line_series(symbol, period, interval)
+    line_x = dates[keep]
+    
+    # Calculate crossovers: a bar is a crossover when the sign of
+    # short MA - long MA differs from the previous bar's
+    above = ind[f'MA{ma_short}'] - ind[f'MA{ma_long}'] > 0
+    flips = np.zeros_like(above)
+    flips[1:] = above[1:] ^ above[:-1]
+    
+    fig = go.Figure()
+    
+    # Add MAs
+    fig.add_trace(go.Scattergl(
+        x=line_x,
+        y=ind[f'MA{ma_short}'][keep],
+        mode='lines',
+        name=f'{ma_short}-day MA',
+        line=dict(color='green', width=2)
+    ))
+    
+    fig.add_trace(go.Scattergl(
+        x=line_x,
+        y=ind[f'MA{ma_long}'][keep],
+        mode='lines',
+        name=f'{ma_long}-day MA',
+        line=dict(color='blue', width=2)
+    ))
+    
+    # Mark crossover points
+    crossover_points = dates[flips]
+    if len(crossover_points) > 0:
+        fig.add_trace(go.Scatter(
+            x=crossover_points,
+            y=closes[flips],
+            mode='markers',
+            marker=dict(size=10, color='red', symbol='star'),
+            name='Crossover Points'
+        ))
+    
+    fig.update_layout(
+        title=f"MA Crossover: {ma_short}-day vs {ma_long}-day",
+        xaxis_title="Date",
+        yaxis_title="Price",
+        height=400
+    )
+    return fig
+
+@st.cache_resource(ttl=300, show_spinner=False)
+def build_rsi_macd_fig(symbol, period, interval):
+    ind = get_indicators(symbol, period, interval)
+    dates, closes, keep = _line_series(symbol, period, interval)
+    line_x = dates[keep]
+    
+    fig = make_subplots(rows=2, cols=1, shared_xaxes=True, 
+                        vertical_spacing=0.1, 
+                        subplot_titles=("RSI", "MACD"), 
+                        row_heights=[0.5, 0.5])
+    
+    # Add RSI
+    fig.add_trace(go.Scattergl(
+        x=line_x,
+        y=ind['RSI'][keep],
+        mode='lines',
+        name='RSI',
+        line=dict(color='blue', width=2)
+    ), row=1, col=1)
+    
+    # Add RSI levels
+    fig.add_trace(go.Scattergl(
+        x=[dates[0], dates[-1]],
+        y=[70, 70],
+        mode='lines',
+        name='Overbought (70)',
+        line=dict(color='red', width=1, dash='dash')
+    ), row=1, col=1)
+    
+    fig.add_trace(go.Scattergl(
+        x=[dates[0], dates[-1]],
+        y=[30, 30],
+        mode='lines',
+        name='Oversold (30)',
+        line=dict(color='green', width=1, dash='dash')
+    ), row=1, col=1)
+    
+    # Add MACD
+    fig.add_trace(go.Scattergl(
+        x=line_x,
+        y=ind['MACD'][keep],
+        mode='lines',
+        name='MACD',
+        line=dict(color='blue', width=2)
+    ), row=2, col=1)
+    
+    fig.add_trace(go.Scattergl(
+        x=line_x,
+        y=ind['Signal'][keep],
+        mode='lines',
+        name='Signal',
+        line=dict(color='red', width=1)
+    ), row=2, col=1)
+    
+    # Add histogram as bar chart
+    fig.add_trace(go.Bar(
+        x=dates,
+        y=ind['Histogram'],
+        name='Histogram',
+        marker_color=np.where(ind['Histogram'] >= 0, 'green', 'red')
+    ), row=2, col=1)
+    
+    fig.update_layout(height=600, showlegend=True)
+    
+    # Update y-axis ranges
+    fig.update_yaxes(range=[0, 100], row=1, col=1)
+    return fig
+
+@st.cache_resource(ttl=300, show_spinner=False)
+def build_rsi_trend_fig(symbol, period, interval):
+    """RSI category scatter for the last 30 bars, or None without RSI data"""
+    rsi = get_indicators(symbol, period, interval)['RSI']
+    rsi_values = rsi[~np.isnan(rsi)]
+    if len(rsi_values) == 0:
+        return None
+    
+    # Bin every RSI value in one binary search: <=30 Oversold, <45 Bearish,
+    # <55 Neutral, <70 Bullish, else Overbought
+    rsi_categories = RSI_CATEGORIES[np.searchsorted(RSI_EDGES, rsi_values, side='right')]
+    
+    last_n = min(30, len(rsi_categories))  # Last 30 days or all available data
+    
+    rsi_df = pd.DataFrame({
+        'Date': get_ticker_history(symbol, period, interval).index[-last_n:].strftime('%Y-%m-%d'),
+        'RSI Value': rsi_values[-last_n:],
+        'Category': rsi_categories[-last_n:]
+    })
+    
+    fig = px.scatter(
+        rsi_df, 
+        x='Date', 
+        y='RSI Value',
+        color='Category',
+        color_discrete_map={
+            'Overbought': 'red',
+            'Bullish': 'lightgreen',
+            'Neutral': 'yellow',
+            'Bearish': 'orange',
+            'Oversold': 'green'
+        },
+        size_max=15,
+        size=[10] * len(rsi_df),
+        title=f"RSI Trend Analysis (Last {last_n} Days)"
+    )
+    
+    fig.update_layout(height=300)
+    return fig
+
+@st.cache_resource(ttl=300, show_spinner=False)
+def build_bollinger_fig(symbol, period, interval):
+    ind = get_indicators(symbol, period, interval)
+    dates, closes, keep = _line_series(symbol, period, interval)
+    line_x = dates[keep]
+    
+    fig = go.Figure()
+    
+    # Add price
+    fig.add_trace(go.Scattergl(
+        x=line_x,
+        y=closes[keep],
+        mode='lines',
+        name='Price',
+        line=dict(color='black', width=2)
+    ))
+    
+    # Add Bollinger Bands
+    fig.add_trace(go.Scattergl(
+        x=line_x,
+        y=ind['Upper'][keep],
+        mode='lines',
+        name='Upper Band',
+        line=dict(color='red', width=1)
+    ))
+    
+    fig.add_trace(go.Scattergl(
+        x=line_x,
+        y=ind['BBMid'][keep],
+        mode='lines',
+        name='20-day MA',
+        line=dict(color='blue', width=1)
+    ))
+    
+    fig.add_trace(go.Scattergl(
+        x=line_x,
+        y=ind['Lower'][keep],
+        mode='lines',
+        name='Lower Band',
+        line=dict(color='green', width=1),
+        fill='tonexty',
+        fillcolor='rgba(0, 100, 80, 0.2)'
+    ))
+    
+    fig.update_layout(
+        title="Bollinger Bands (20-day, 2 std)",
+        xaxis_title="Date",
+        yaxis_title="Price",
+        height=500
+    )
+    return fig
+
+@st.cache_resource(ttl=300, show_spinner=False)
+def build_bb_width_fig(symbol, period, interval):
+    ind = get_indicators(symbol, period, interval)
+    dates, _, keep = _line_series(symbol, period, interval)
+    
+    fig = go.Figure()
+    
+    fig.add_trace(go.Scattergl(
+        x=dates[keep],
+        y=ind['BBWidth'][keep],
+        mode='lines',
+        name='BB Width',
+        line=dict(color='purple', width=2)
+    ))
+    
+    fig.update_layout(
+        title="Bollinger Band Width (Volatility Indicator)",
+        xaxis_title="Date",
+        yaxis_title="Band Width",
+        height=300
+    )
+    return fig
+
+@st.cache_resource(ttl=300, show_spinner=False)
+def build_volume_by_price_fig(symbol, period, interval, period_label):
+    hist = get_ticker_history(symbol, period, interval)
+    
+    # Volume by price level analysis: one weighted histogram over ten equal-width price bins
+    volume_by_price, edges = np.histogram(
+        hist['Close'].to_numpy(),
+        bins=10,
+        weights=hist['Volume'].to_numpy()
+    )
+    
+    # Convert to dataframe for plotting
+    price_volume_df = pd.DataFrame({
+        # np.histogram bins are [lo, hi) except the last, which also includes the max
+        'Price Range': [f"[{lo:.2f}, {hi:.2f})" for lo, hi in zip(edges[:-2], edges[1:-1])]
+                       + [f"[{edges[-2]:.2f}, {edges[-1]:.2f}]"],
+        'Volume': volume_by_price
+    })
+    
+    # Create horizontal bar chart
+    fig = px.bar(
+        price_volume_df,
+        y='Price Range',
+        x='Volume',
+        orientation='h',
+        title=f"Volume by Price Range - {period_label}",
+        color='Volume',
+        color_continuous_scale=['lightblue', 'darkblue']
+    )
+    
+    fig.update_layout(height=500)
+    return fig
+
+@st.cache_resource(ttl=300, show_spinner=False)
+def build_trading_days_fig(positive_days, negative_days, neutral_days, period_label):
+    total_days = positive_days + negative_days + neutral_days
+    metrics_data = pd.DataFrame([
+        {'Metric': 'Positive Days', 'Value': positive_days, 'Percentage': positive_days/total_days*100},
+        {'Metric': 'Negative Days', 'Value': negative_days, 'Percentage': negative_days/total_days*100},
+        {'Metric': 'Neutral Days', 'Value': neutral_days, 'Percentage': neutral_days/total_days*100},
+    ])
+    
+    fig = px.pie(
+        metrics_data, 
+        values='Value', 
+        names='Metric', 
+        title=f"Trading Days Analysis - {period_label}",
+        color='Metric',
+        color_discrete_map={
+            'Positive Days': 'green', 
+            'Negative Days': 'red', 
+            'Neutral Days': 'gray'
+        }
+    )
+    
+    fig.update_traces(textposition='inside', textinfo='percent+label')
+    fig.update_layout(height=300)
+    return fig
+
+@st.cache_resource(ttl=300, show_spinner=False)
+def build_return_dist_fig(symbol, period, interval):
+    returns = get_indicators(symbol, period, interval)['Daily Return']
+    
+    fig = px.histogram(
+        x=returns,
+        labels={'x': 'Daily Return'},
+        nbins=50,
+        title="Daily Return Distribution",
+        color_discrete_sequence=['lightblue']
+    )
+    
+    fig.add_vline(x=0, line_width=2, line_dash="dash", line_color="black")
+    fig.add_vline(x=np.nanmean(returns), line_width=2, line_color="green", annotation_text="Mean")
+    
+    fig.update_layout(height=400)
+    return fig
+
+# The technical views are a fragment: switching the view or the MA selectors
+# reruns only this section, not the fetches, price chart and metrics above it
+@st.fragment
+def display_technical_analysis(symbol, period, period_label, interval, price_fig, closes):
+    # Pick one technical view at a time; unlike st.tabs, which runs every
+    # tab body on each rerun, only the selected view is computed and drawn
+    view = st.radio(
+        "Technical indicator view",
+        ["Moving Averages", "RSI & MACD", "Bollinger Bands", "Volume Analysis", "Performance Metrics"],
+        horizontal=True,
+        label_visibility="collapsed"
+    )
+    ind = get_indicators(symbol, period, interval)
+    chart_args = (symbol, period, interval)
+    
+    if view == "Moving Averages":
+        st.plotly_chart(build_ma_fig(*chart_args), use_container_width=True)
+        
+        # Add moving average crossover visualization
+        st.subheader("Moving Average Crossovers")
+        ma_short = st.selectbox("Select short-term MA", [5, 10, 20], index=0)
+        ma_long = st.selectbox("Select long-term MA", [20, 50, 200], index=1)
+        
+        if f'MA{ma_short}' in ind and f'MA{ma_long}' in ind:
+            st.plotly_chart(build_crossover_fig(*chart_args, ma_short, ma_long), use_container_width=True)
+    
+    elif view == "RSI & MACD":
+        st.plotly_chart(build_rsi_macd_fig(*chart_args), use_container_width=True)
+        
+        # Add RSI heatmap visualization
+        st.subheader("RSI Trend Analysis")
+        
+        fig_rsi_heat = build_rsi_trend_fig(*chart_args)
+        if fig_rsi_heat is not None:
+            st.plotly_chart(fig_rsi_heat, use_container_width=True)
+    
+    elif view == "Bollinger Bands":
+        st.plotly_chart(build_bollinger_fig(*chart_args), use_container_width=True)
+        st.plotly_chart(build_bb_width_fig(*chart_args), use_container_width=True)
+    
+    elif view == "Volume Analysis":
+        st.plotly_chart(build_volume_by_price_fig(*chart_args, period_label), use_container_width=True)
+        
+        # Same candlestick and volume figure as the top of the page; the key
+        # keeps Streamlit from treating it as a duplicate element
+        st.plotly_chart(price_fig, use_container_width=True, key="volume_view_price_chart")
+    
+    elif view == "Performance Metrics":
+        # Performance Metrics
+        
+        # Daily returns from the cached indicators
+        returns = ind['Daily Return']
+        
+        # Calculate metrics from two boolean masks (NaN compares False in both)
+        up = returns > 0
+        down = returns < 0
+        total_days = len(returns)
+        positive_days = int(up.sum())
+        negative_days = int(down.sum())
+        neutral_days = total_days - positive_days - negative_days
+        
+        avg_positive = returns[up].mean() if positive_days else np.nan
+        avg_negative = returns[down].mean() if negative_days else np.nan
+        
+        max_gain = np.nanmax(returns)
+        max_loss = np.nanmin(returns)
+        
+        volatility = np.nanstd(returns, ddof=1)
+        
+        st.plotly_chart(build_trading_days_fig(positive_days, negative_days, neutral_days, period_label),
+                        use_container_width=True)
+        
+        # Create metrics table
+        col1, col2 = st.columns(2)
+        
+        with col1:
+            st.metric("Average Gain on Up Days", f"{avg_positive:.2f}%", delta=f"{max_gain:.2f}% max")
+            st.metric("Daily Volatility", f"{volatility:.2f}%")
+        
+        with col2:
+            st.metric("Average Loss on Down Days", f"{avg_negative:.2f}%", delta=f"{max_loss:.2f}% max", delta_color="inverse")
+            st.metric("Total Return", f"{closes[-1]/closes[0]*100-100:.2f}%")
+        
+        # Return distribution chart
+        st.plotly_chart(build_return_dist_fig(*chart_args), use_container_width=True)
 
 # Main content
 if ticker_input:
     try:
-        # Get stock data from Yahoo Finance
-        stock = yf.Ticker(ticker_input)
-        info = stock.info
-        hist_data = stock.history(period=time_periods[selected_period], interval=interval)
+        # Yahoo info, Yahoo history and the database records are independent
+        # round trips, so they are fetched concurrently
+        executor = ThreadPoolExecutor(max_workers=3)
+        info_future = executor.submit(get_ticker_info, ticker_input)
+        hist_future = executor.submit(get_ticker_history, ticker_input, time_periods[selected_period], interval)
+        db_future = executor.submit(get_db_history, ticker_input)
+        # Don't block the page on the database lookup; it is read further down
+        executor.shutdown(wait=False)
+        info = info_future.result()
+        hist_data = hist_future.result()
         
         # Display stock information
         col1, col2, col3 = st.columns([2, 1, 1])
@@ -222,41 +671,17 @@ if ticker_input:
         st.subheader(f"Price History - {selected_period} ({selected_interval})")
         
         if not hist_data.empty:
-            # Create figure with candlestick chart
-            fig = go.Figure(data=[go.Candlestick(
-                x=hist_data.index,
-                open=hist_data['Open'],
-                high=hist_data['High'],
-                low=hist_data['Low'],
-                close=hist_data['Close'],
-                name="Price"
-            )])
-            
-            # Add volume as a bar chart on a secondary axis
-            fig.add_trace(go.Bar(
-                x=hist_data.index,
-                y=hist_data['Volume'],
-                name="Volume",
-                yaxis="y2",
-                opacity=0.3
-            ))
+            # Columns as NumPy arrays for the metrics below
+            opens = hist_data['Open'].to_numpy()
+            highs = hist_data['High'].to_numpy()
+            lows = hist_data['Low'].to_numpy()
+            closes = hist_data['Close'].to_numpy()
+            volumes = hist_data['Volume'].to_numpy()
             
-            # Set up layout with secondary y-axis for volume
-            fig.update_layout(
-                title=f"{company_name} Stock Price",
-                yaxis_title="Price ($)",
-                xaxis_title="Date",
-                yaxis2=dict(
-                    title="Volume",
-                    overlaying="y",
-                    side="right",
-                    showgrid=False
-                ),
-                height=600,
-                hovermode="x unified"
-            )
-            
-            st.plotly_chart(fig, use_container_width=True)
+            # Candlestick and volume figure, built once and reused by the Volume Analysis view
+            price_fig = build_price_volume_fig(ticker_input, time_periods[selected_period], interval,
+                                               f"{company_name} Stock Price")
+            st.plotly_chart(price_fig, use_container_width=True)
             
             # Calculate and display key metrics
             st.subheader("Key Metrics")
@@ -266,22 +691,22 @@ if ticker_input:
             with metrics_col1:
                 st.metric(
                     label="Open",
-                    value=f"${hist_data['Open'].iloc[-1]:.2f}"
+                    value=f"${opens[-1]:.2f}"
                 )
             with metrics_col2:
                 st.metric(
                     label="High", 
-                    value=f"${hist_data['High'].iloc[-1]:.2f}"
+                    value=f"${highs[-1]:.2f}"
                 )
             with metrics_col3:
                 st.metric(
                     label="Low", 
-                    value=f"${hist_data['Low'].iloc[-1]:.2f}"
+                    value=f"${lows[-1]:.2f}"
                 )
             with metrics_col4:
                 st.metric(
                     label="Close", 
-                    value=f"${hist_data['Close'].iloc[-1]:.2f}"
+                    value=f"${closes[-1]:.2f}"
                 )
             
             # Performance metrics
@@ -289,11 +714,11 @@ if ticker_input:
             perf_col1, perf_col2, perf_col3 = st.columns(3)
             
             # Calculate performance metrics
-            period_high = hist_data['High'].max()
-            period_low = hist_data['Low'].min()
-            period_avg = hist_data['Close'].mean()
-            period_start = hist_data['Open'].iloc[0]
-            period_end = hist_data['Close'].iloc[-1]
+            period_high = np.nanmax(highs)
+            period_low = np.nanmin(lows)
+            period_avg = np.nanmean(closes)
+            period_start = opens[0]
+            period_end = closes[-1]
             period_change = period_end - period_start
             period_percent = (period_change / period_start * 100) if period_start else 0
             
@@ -314,7 +739,7 @@ if ticker_input:
                 )
                 st.metric(
                     label=f"{selected_period} Avg. Volume", 
-                    value=f"{hist_data['Volume'].mean():,.0f}"
+                    value=f"{np.nanmean(volumes):,.0f}"
                 )
             
             with perf_col3:
@@ -330,510 +755,62 @@ if ticker_input:
             st.subheader("Technical Analysis")
             
             if not hist_data.empty and len(hist_data) > 14:  # Need at least 14 days for some indicators
-                # Create tabs for different technical indicators
-                tab1, tab2, tab3, tab4, tab5 = st.tabs(["Moving Averages", "RSI & MACD", "Bollinger Bands", "Volume Analysis", "Performance Metrics"])
-                
-                with tab1:
-                    # Moving averages
-                    ma_periods = [5, 10, 20, 50, 200]
-                    for period in ma_periods:
-                        if len(hist_data) >= period:
-                            hist_data[f'MA{period}'] = hist_data['Close'].rolling(window=period).mean()
-                    
-                    # Create figure
-                    fig = go.Figure()
-                    
-                    # Add price
-                    fig.add_trace(go.Scatter(
-                        x=hist_data.index,
-                        y=hist_data['Close'],
-                        mode='lines',
-                        name='Price',
-                        line=dict(color='black', width=2)
-                    ))
-                    
-                    # Add moving averages
-                    colors = ['blue', 'green', 'red', 'purple', 'orange']
-                    for i, period in enumerate(ma_periods):
-                        if f'MA{period}' in hist_data.columns:
-                            fig.add_trace(go.Scatter(
-                                x=hist_data.index,
-                                y=hist_data[f'MA{period}'],
-                                mode='lines',
-                                name=f'{period}-day MA',
-                                line=dict(color=colors[i % len(colors)])
-                            ))
-                    
-                    fig.update_layout(
-                        title="Moving Averages",
-                        xaxis_title="Date",
-                        yaxis_title="Price",
-                        height=500
-                    )
-                    
-                    st.plotly_chart(fig, use_container_width=True)
-                    
-                    # Add moving average crossover visualization
-                    st.subheader("Moving Average Crossovers")
-                    ma_short = st.selectbox("Select short-term MA", [5, 10, 20], index=0)
-                    ma_long = st.selectbox("Select long-term MA", [20, 50, 200], index=1)
-                    
-                    if f'MA{ma_short}' in hist_data.columns and f'MA{ma_long}' in hist_data.columns:
-                        # Calculate crossovers
-                        hist_data['Crossover'] = hist_data[f'MA{ma_short}'] - hist_data[f'MA{ma_long}']
-                        hist_data['Signal'] = np.where(hist_data['Crossover'] > 0, 1, -1)
-                        
-                        # Create crossover visualization
-                        fig_cross = go.Figure()
-                        
-                        # Add MAs
-                        fig_cross.add_trace(go.Scatter(
-                            x=hist_data.index,
-                            y=hist_data[f'MA{ma_short}'],
-                            mode='lines',
-                            name=f'{ma_short}-day MA',
-                            line=dict(color='green', width=2)
-                        ))
-                        
-                        fig_cross.add_trace(go.Scatter(
-                            x=hist_data.index,
-                            y=hist_data[f'MA{ma_long}'],
-                            mode='lines',
-                            name=f'{ma_long}-day MA',
-                            line=dict(color='blue', width=2)
-                        ))
-                        
-                        # Mark crossover points
-                        crossover_points = hist_data.index[hist_data['Signal'].diff() != 0].tolist()
-                        if len(crossover_points) > 0:
-                            crossover_values = hist_data.loc[crossover_points, 'Close'].tolist()
-                            
-                            fig_cross.add_trace(go.Scatter(
-                                x=crossover_points,
-                                y=crossover_values,
-                                mode='markers',
-                                marker=dict(size=10, color='red', symbol='star'),
-                                name='Crossover Points'
-                            ))
-                        
-                        fig_cross.update_layout(
-                            title=f"MA Crossover: {ma_short}-day vs {ma_long}-day",
-                            xaxis_title="Date",
-                            yaxis_title="Price",
-                            height=400
-                        )
-                        
-                        st.plotly_chart(fig_cross, use_container_width=True)
-                
-                with tab2:
-                    # RSI
-                    delta = hist_data['Close'].diff()
-                    gain = delta.where(delta > 0, 0)
-                    loss = -delta.where(delta < 0, 0)
-                    
-                    avg_gain = gain.rolling(window=14).mean()
-                    avg_loss = loss.rolling(window=14).mean()
-                    
-                    rs = avg_gain / avg_loss
-                    hist_data['RSI'] = 100 - (100 / (1 + rs))
-                    
-                    # MACD
-                    hist_data['EMA12'] = hist_data['Close'].ewm(span=12, adjust=False).mean()
-                    hist_data['EMA26'] = hist_data['Close'].ewm(span=26, adjust=False).mean()
-                    hist_data['MACD'] = hist_data['EMA12'] - hist_data['EMA26']
-                    hist_data['Signal'] = hist_data['MACD'].ewm(span=9, adjust=False).mean()
-                    hist_data['Histogram'] = hist_data['MACD'] - hist_data['Signal']
-                    
-                    # Create subplot figure
-                    fig = make_subplots(rows=2, cols=1, shared_xaxes=True, 
-                                       vertical_spacing=0.1, 
-                                       subplot_titles=("RSI", "MACD"), 
-                                       row_heights=[0.5, 0.5])
-                    
-                    # Add RSI
-                    fig.add_trace(go.Scatter(
-                        x=hist_data.index,
-                        y=hist_data['RSI'],
-                        mode='lines',
-                        name='RSI',
-                        line=dict(color='blue', width=2)
-                    ), row=1, col=1)
-                    
-                    # Add RSI levels
-                    fig.add_trace(go.Scatter(
-                        x=[hist_data.index[0], hist_data.index[-1]],
-                        y=[70, 70],
-                        mode='lines',
-                        name='Overbought (70)',
-                        line=dict(color='red', width=1, dash='dash')
-                    ), row=1, col=1)
-                    
-                    fig.add_trace(go.Scatter(
-                        x=[hist_data.index[0], hist_data.index[-1]],
-                        y=[30, 30],
-                        mode='lines',
-                        name='Oversold (30)',
-                        line=dict(color='green', width=1, dash='dash')
-                    ), row=1, col=1)
-                    
-                    # Add MACD
-                    fig.add_trace(go.Scatter(
-                        x=hist_data.index,
-                        y=hist_data['MACD'],
-                        mode='lines',
-                        name='MACD',
-                        line=dict(color='blue', width=2)
-                    ), row=2, col=1)
-                    
-                    fig.add_trace(go.Scatter(
-                        x=hist_data.index,
-                        y=hist_data['Signal'],
-                        mode='lines',
-                        name='Signal',
-                        line=dict(color='red', width=1)
-                    ), row=2, col=1)
-                    
-                    # Add histogram as bar chart
-                    colors = ['green' if val >= 0 else 'red' for val in hist_data['Histogram']]
-                    fig.add_trace(go.Bar(
-                        x=hist_data.index,
-                        y=hist_data['Histogram'],
-                        name='Histogram',
-                        marker_color=colors
-                    ), row=2, col=1)
-                    
-                    fig.update_layout(height=600, showlegend=True)
-                    
-                    # Update y-axis ranges
-                    fig.update_yaxes(range=[0, 100], row=1, col=1)
-                    
-                    st.plotly_chart(fig, use_container_width=True)
-                    
-                    # Add RSI heatmap visualization
-                    st.subheader("RSI Trend Analysis")
-                    
-                    # Ensure we have RSI data
-                    if not hist_data['RSI'].isna().all() and len(hist_data['RSI'].dropna()) > 0:
-                        # Create RSI heatmap data
-                        rsi_categories = []
-                        for rsi_value in hist_data['RSI'].dropna():
-                            if rsi_value >= 70:
-                                rsi_categories.append("Overbought")
-                            elif rsi_value <= 30:
-                                rsi_categories.append("Oversold")
-                            elif 30 < rsi_value < 45:
-                                rsi_categories.append("Bearish")
-                            elif 45 <= rsi_value < 55:
-                                rsi_categories.append("Neutral")
-                            else:  # 55 <= rsi_value < 70
-                                rsi_categories.append("Bullish")
-                        
-                        last_n = min(30, len(rsi_categories))  # Last 30 days or all available data
-                        
-                        rsi_df = pd.DataFrame({
-                            'Date': hist_data.index[-last_n:].strftime('%Y-%m-%d'),
-                            'RSI Value': hist_data['RSI'].values[-last_n:],
-                            'Category': rsi_categories[-last_n:]
-                        })
-                        
-                        fig_rsi_heat = px.scatter(
-                            rsi_df, 
-                            x='Date', 
-                            y='RSI Value',
-                            color='Category',
-                            color_discrete_map={
-                                'Overbought': 'red',
-                                'Bullish': 'lightgreen',
-                                'Neutral': 'yellow',
-                                'Bearish': 'orange',
-                                'Oversold': 'green'
-                            },
-                            size_max=15,
-                            size=[10] * len(rsi_df),
-                            title=f"RSI Trend Analysis (Last {last_n} Days)"
-                        )
-                        
-                        fig_rsi_heat.update_layout(height=300)
-                        st.plotly_chart(fig_rsi_heat, use_container_width=True)
-                
-                with tab3:
-                    # Bollinger Bands
-                    window = 20
-                    hist_data['MA20'] = hist_data['Close'].rolling(window=window).mean()
-                    hist_data['STD'] = hist_data['Close'].rolling(window=window).std()
-                    hist_data['Upper'] = hist_data['MA20'] + (hist_data['STD'] * 2)
-                    hist_data['Lower'] = hist_data['MA20'] - (hist_data['STD'] * 2)
-                    
-                    # Create figure
-                    fig = go.Figure()
-                    
-                    # Add price
-                    fig.add_trace(go.Scatter(
-                        x=hist_data.index,
-                        y=hist_data['Close'],
-                        mode='lines',
-                        name='Price',
-                        line=dict(color='black', width=2)
-                    ))
-                    
-                    # Add Bollinger Bands
-                    fig.add_trace(go.Scatter(
-                        x=hist_data.index,
-                        y=hist_data['Upper'],
-                        mode='lines',
-                        name='Upper Band',
-                        line=dict(color='red', width=1)
-                    ))
-                    
-                    fig.add_trace(go.Scatter(
-                        x=hist_data.index,
-                        y=hist_data['MA20'],
-                        mode='lines',
-                        name='20-day MA',
-                        line=dict(color='blue', width=1)
-                    ))
-                    
-                    fig.add_trace(go.Scatter(
-                        x=hist_data.index,
-                        y=hist_data['Lower'],
-                        mode='lines',
-                        name='Lower Band',
-                        line=dict(color='green', width=1),
-                        fill='tonexty',
-                        fillcolor='rgba(0, 100, 80, 0.2)'
-                    ))
-                    
-                    fig.update_layout(
-                        title="Bollinger Bands (20-day, 2 std)",
-                        xaxis_title="Date",
-                        yaxis_title="Price",
-                        height=500
-                    )
-                    
-                    st.plotly_chart(fig, use_container_width=True)
-                    
-                    # Calculate Bollinger Band width
-                    hist_data['BBWidth'] = (hist_data['Upper'] - hist_data['Lower']) / hist_data['MA20']
-                    
-                    # Create Bollinger Band Width chart
-                    fig_bbw = go.Figure()
-                    
-                    fig_bbw.add_trace(go.Scatter(
-                        x=hist_data.index,
-                        y=hist_data['BBWidth'],
-                        mode='lines',
-                        name='BB Width',
-                        line=dict(color='purple', width=2)
-                    ))
-                    
-                    fig_bbw.update_layout(
-                        title="Bollinger Band Width (Volatility Indicator)",
-                        xaxis_title="Date",
-                        yaxis_title="Band Width",
-                        height=300
-                    )
-                    
-                    st.plotly_chart(fig_bbw, use_container_width=True)
-                
-                with tab4:
-                    # Volume Analysis
-                    
-                    # Volume by price level analysis
-                    price_buckets = pd.cut(hist_data['Close'], bins=10)
-                    volume_by_price = hist_data.groupby(price_buckets)['Volume'].sum()
-                    
-                    # Convert to dataframe for plotting
-                    price_volume_df = pd.DataFrame({
-                        'Price Range': [str(x) for x in volume_by_price.index],
-                        'Volume': volume_by_price.values
-                    })
-                    
-                    # Create horizontal bar chart
-                    fig_vol_price = px.bar(
-                        price_volume_df,
-                        y='Price Range',
-                        x='Volume',
-                        orientation='h',
-                        title=f"Volume by Price Range - {selected_period}",
-                        color='Volume',
-                        color_continuous_scale=['lightblue', 'darkblue']
-                    )
-                    
-                    fig_vol_price.update_layout(height=500)
-                    st.plotly_chart(fig_vol_price, use_container_width=True)
-                    
-                    # Create candlestick with volume
-                    colors = ['green' if row['Close'] >= row['Open'] else 'red' for _, row in hist_data.iterrows()]
-                    
-                    fig_vol = make_subplots(rows=2, cols=1, shared_xaxes=True, 
-                                           vertical_spacing=0.03, 
-                                           row_heights=[0.7, 0.3])
-                    
-                    # Add candlestick
-                    fig_vol.add_trace(go.Candlestick(
-                        x=hist_data.index,
-                        open=hist_data['Open'],
-                        high=hist_data['High'],
-                        low=hist_data['Low'],
-                        close=hist_data['Close'],
-                        name="Price"
-                    ), row=1, col=1)
-                    
-                    # Add volume
-                    fig_vol.add_trace(go.Bar(
-                        x=hist_data.index,
-                        y=hist_data['Volume'],
-                        marker_color=colors,
-                        name="Volume"
-                    ), row=2, col=1)
-                    
-                    fig_vol.update_layout(
-                        title="Price and Volume Analysis",
-                        xaxis_title="Date",
-                        yaxis_title="Price",
-                        xaxis_rangeslider_visible=False,
-                        height=600
-                    )
-                    
-                    fig_vol.update_yaxes(title_text="Volume", row=2, col=1)
-                    
-                    st.plotly_chart(fig_vol, use_container_width=True)
-                
-                with tab5:
-                    # Performance Metrics
-                    
-                    # Calculate daily returns
-                    hist_data['Daily Return'] = hist_data['Close'].pct_change() * 100
-                    
-                    # Calculate metrics
-                    total_days = len(hist_data)
-                    positive_days = len(hist_data[hist_data['Daily Return'] > 0])
-                    negative_days = len(hist_data[hist_data['Daily Return'] < 0])
-                    neutral_days = total_days - positive_days - negative_days
-                    
-                    avg_positive = hist_data[hist_data['Daily Return'] > 0]['Daily Return'].mean()
-                    avg_negative = hist_data[hist_data['Daily Return'] < 0]['Daily Return'].mean()
-                    
-                    max_gain = hist_data['Daily Return'].max()
-                    max_loss = hist_data['Daily Return'].min()
-                    
-                    volatility = hist_data['Daily Return'].std()
-                    
-                    # Create metrics visual
-                    metrics_data = pd.DataFrame([
-                        {'Metric': 'Positive Days', 'Value': positive_days, 'Percentage': positive_days/total_days*100},
-                        {'Metric': 'Negative Days', 'Value': negative_days, 'Percentage': negative_days/total_days*100},
-                        {'Metric': 'Neutral Days', 'Value': neutral_days, 'Percentage': neutral_days/total_days*100},
-                    ])
-                    
-                    # Create pie chart
-                    fig_pie = px.pie(
-                        metrics_data, 
-                        values='Value', 
-                        names='Metric', 
-                        title=f"Trading Days Analysis - {selected_period}",
-                        color='Metric',
-                        color_discrete_map={
-                            'Positive Days': 'green', 
-                            'Negative Days': 'red', 
-                            'Neutral Days': 'gray'
-                        }
-                    )
-                    
-                    fig_pie.update_traces(textposition='inside', textinfo='percent+label')
-                    fig_pie.update_layout(height=300)
-                    st.plotly_chart(fig_pie, use_container_width=True)
-                    
-                    # Create metrics table
-                    col1, col2 = st.columns(2)
-                    
-                    with col1:
-                        st.metric("Average Gain on Up Days", f"{avg_positive:.2f}%", delta=f"{max_gain:.2f}% max")
-                        st.metric("Daily Volatility", f"{volatility:.2f}%")
-                    
-                    with col2:
-                        st.metric("Average Loss on Down Days", f"{avg_negative:.2f}%", delta=f"{max_loss:.2f}% max", delta_color="inverse")
-                        st.metric("Total Return", f"{hist_data['Close'].iloc[-1]/hist_data['Close'].iloc[0]*100-100:.2f}%")
-                    
-                    # Return distribution chart
-                    fig_dist = px.histogram(
-                        hist_data,
-                        x='Daily Return',
-                        nbins=50,
-                        title="Daily Return Distribution",
-                        color_discrete_sequence=['lightblue']
-                    )
-                    
-                    fig_dist.add_vline(x=0, line_width=2, line_dash="dash", line_color="black")
-                    fig_dist.add_vline(x=hist_data['Daily Return'].mean(), line_width=2, line_color="green", annotation_text="Mean")
-                    
-                    fig_dist.update_layout(height=400)
-                    st.plotly_chart(fig_dist, use_container_width=True)
+                display_technical_analysis(ticker_input, time_periods[selected_period], selected_period,
+                                           interval, price_fig, closes)
             else:
                 st.info("Insufficient historical data for technical analysis. Choose a longer time period.")
                 
             # Historical trends
             st.subheader("Historical Data")
-            st.dataframe(hist_data, use_container_width=True)
+            # Only OHLCV is shown; prices stay float64 so high-priced stocks display exactly
+            st.dataframe(
+                hist_data[['Open', 'High', 'Low', 'Close', 'Volume']],
+                use_container_width=True
+            )
             
             # Check if there is historical data in the database
-            try:
-                db_data = db_utils.get_historical_performance(ticker_input)
+            db_data, db_error = db_future.result()
+            if db_error is not None:
+                st.warning(f"Error retrieving database records: {db_error}")
+            elif not db_data.empty:
+                st.subheader("Database Historical Records")
                 
-                if not db_data.empty:
-                    st.subheader("Database Historical Records")
-                    
-                    # Create a more readable dataframe
-                    display_cols = [
-                        'ticker', 'current_price', 'price_change', 
-                        'percent_change', 'volume', 'market_cap',
-                        'index_name', 'time_period', 'recorded_date'
-                    ]
+                # Create a more readable dataframe from the stored fields
+                display_df = db_data.rename(columns={
+                    'ticker': 'Ticker',
+                    'current_price': 'Price',
+                    'percent_change': 'Percent Change (%)',
+                    'volume': 'Volume',
+                    'timestamp': 'Date',
+                    'period': 'Time Period'
+                })
+                
+                # Columns stay numeric and are formatted by the grid
+                st.dataframe(
+                    display_df,
+                    column_config={
+                        'Price': st.column_config.NumberColumn(format='$%.2f'),
+                        'Percent Change (%)': st.column_config.NumberColumn(format='%.2f%%'),
+                        'Volume': st.column_config.NumberColumn(format='%d')
+                    },
+                    use_container_width=True
+                )
+                
+                # Create a line chart of historical price changes
+                if len(display_df) > 1:
+                    chart_data = display_df.sort_values('Date')
+                    
+                    fig = px.line(
+                        chart_data[['Date', 'Price']],
+                        x='Date',
+                        y='Price',
+                        title=f"{ticker_input} Historical Price (Database Records)",
+                        markers=True
+                    )
                     
-                    if all(col in db_data.columns for col in display_cols):
-                        display_df = db_data[display_cols].copy()
-                        
-                        # Format the data
-                        display_df = display_df.rename(columns={
-                            'ticker': 'Ticker',
-                            'current_price': 'Price',
-                            'price_change': 'Price Change',
-                            'percent_change': 'Percent Change (%)',
-                            'volume': 'Volume',
-                            'market_cap': 'Market Cap',
-                            'index_name': 'Index',
-                            'time_period': 'Time Period',
-                            'recorded_date': 'Date'
-                        })
-                        
-                        display_df['Price'] = display_df['Price'].round(2)
-                        display_df['Price Change'] = display_df['Price Change'].round(2)
-                        display_df['Percent Change (%)'] = display_df['Percent Change (%)'].round(2)
-                        display_df['Market Cap'] = display_df['Market Cap'].apply(
-                            lambda x: f"${x/1e9:.2f}B" if x else 'N/A'
-                        )
-                        
-                        st.dataframe(display_df, use_container_width=True)
-                        
-                        # Create a line chart of historical price changes
-                        if len(display_df) > 1:
-                            chart_data = display_df.sort_values('Date')
-                            
-                            fig = px.line(
-                                chart_data,
-                                x='Date',
-                                y='Price',
-                                title=f"{ticker_input} Historical Price (Database Records)",
-                                markers=True
-                            )
-                            
-                            st.plotly_chart(fig, use_container_width=True)
-                    else:
-                        st.info("Database records found but missing expected columns.")
-                else:
-                    st.info("No database records found for this stock.")
-            except Exception as e:
-                st.warning(f"Error retrieving database records: {e}")
+                    st.plotly_chart(fig, use_container_width=True)
+            else:
+                st.info("No database records found for this stock.")
         else:
             st.warning("No historical data available for the selected time period.")
     except Exception as e:
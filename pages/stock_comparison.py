@@ -1,9 +1,10 @@
 import streamlit as st
-import yfinance as yf
 import pandas as pd
-import plotly.express as px
+import numpy as np
 import plotly.graph_objects as go
-from datetime import datetime, timedelta
+import ui_utils
+import yf_utils
+from chart_utils import bucket_starts, epoch_ms, lttb_indices
 
 # Set page configuration
 st.set_page_config(
@@ -13,49 +14,7 @@ st.set_page_config(
 )
 
 # Custom CSS for better styling
-st.markdown("""
-<style>
-    /* Main page styling */
-    .main .block-container {
-        padding-top: 2rem;
-        padding-bottom: 2rem;
-    }
-    
-    /* Header styling */
-    h1, h2, h3 {
-        color: #1E88E5;
-        font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-    }
-    
-    h1 {
-        background: linear-gradient(to right, #1E88E5, #42A5F5);
-        -webkit-background-clip: text;
-        -webkit-text-fill-color: transparent;
-        font-size: 3rem;
-        font-weight: 800;
-        margin-bottom: 1.5rem;
-    }
-    
-    /* Stock cards styling */
-    .stock-card {
-        background-color: #f8f9fa;
-        border-radius: 10px;
-        padding: 1rem;
-        margin-bottom: 1rem;
-        box-shadow: 0 2px 5px rgba(0,0,0,0.05);
-    }
-    
-    /* Metric styling */
-    div[data-testid="stMetricValue"] {
-        font-size: 1.3rem;
-        font-weight: bold;
-    }
-    
-    div[data-testid="stMetricDelta"] {
-        font-size: 1rem;
-    }
-</style>
-""", unsafe_allow_html=True)
+ui_utils.inject_css("stock_comparison.css")
 
 # Page title
 st.title("📊 Stock Comparison")
@@ -106,26 +65,138 @@ selected_period = st.sidebar.selectbox(
 @st.cache_data(ttl=3600)  # Cache for 1 hour
 def get_stock_data(symbols, period):
     data = {}
+    try:
+        # One batched download for every stock not already in the disk cache
+        hists = yf_utils.histories([stocks[symbol] for symbol in symbols], periods[period], ttl=3600)
+    except Exception as e:
+        st.error(f"Error fetching stock data: {e}")
+        return data
     for symbol in symbols:
-        try:
-            stock = yf.Ticker(stocks[symbol])
-            hist = stock.history(period=periods[period])
-            if not hist.empty:
-                # Calculate daily returns
-                hist['Daily Return'] = hist['Close'].pct_change() * 100
-                data[symbol] = {
-                    'data': hist,
-                    'current': hist['Close'].iloc[-1],
-                    'change': hist['Close'].iloc[-1] - hist['Close'].iloc[0],
-                    'percent_change': ((hist['Close'].iloc[-1] / hist['Close'].iloc[0]) - 1) * 100,
-                    'high': hist['High'].max(),
-                    'low': hist['Low'].min(),
-                    'volume': hist['Volume'].mean()
-                }
-        except Exception as e:
-            st.error(f"Error fetching data for {symbol}: {e}")
+        hist = hists.get(stocks[symbol])
+        if hist is None:
+            continue
+        data[symbol] = {
+            'data': hist,
+            'current': hist['Close'].iloc[-1],
+            'change': hist['Close'].iloc[-1] - hist['Close'].iloc[0],
+            'percent_change': ((hist['Close'].iloc[-1] / hist['Close'].iloc[0]) - 1) * 100,
+            'high': hist['High'].max(),
+            'low': hist['Low'].min(),
+            'volume': hist['Volume'].mean()
+        }
     return data
 
+# One date-aligned frame of closes, one column per stock
+def get_closes(symbols, period):
+    return pd.concat({symbol: data['data']['Close'] for symbol, data in get_stock_data(symbols, period).items()}, axis=1)
+
+# Comparison figures are kept as objects by st.cache_resource, so reruns that
+# don't change the stocks or period skip building them. uirevision keeps the
+# browser's zoom and pan across those reruns
+@st.cache_resource(ttl=3600)
+def build_price_fig(symbols, period):
+    fig = go.Figure()
+    
+    for symbol, data in get_stock_data(symbols, period).items():
+        # Thin each line to the chart's point budget (a no-op for short periods)
+        keep = lttb_indices(data['data']['Close'].to_numpy())
+        # Epoch-ms ints and float32 prices travel as packed binary, half the size
+        # of date strings and float64
+        fig.add_trace(go.Scattergl(
+            x=epoch_ms(data['data'].index[keep]),
+            y=data['data']['Close'].to_numpy(dtype=np.float32)[keep],
+            name=symbol,
+            mode='lines'
+        ))
+    
+    fig.update_layout(
+        title=f"Price Comparison - {period}",
+        xaxis_title="Date",
+        yaxis_title="Price (₹)",
+        height=600,
+        uirevision=f"price-{period}-{'-'.join(symbols)}"
+    )
+    fig.update_xaxes(type='date')
+    return fig
+
+@st.cache_resource(ttl=3600)
+def build_performance_fig(symbols, period):
+    # Normalized to 100 in a single divide by each stock's first close
+    closes = get_closes(symbols, period)
+    normalized = closes.div(closes.bfill().iloc[0]) * 100
+    
+    fig = go.Figure()
+    
+    for symbol in normalized.columns:
+        # Dates another stock traded on but this one did not are NaN here
+        series = normalized[symbol].dropna()
+        keep = lttb_indices(series.to_numpy())
+        fig.add_trace(go.Scattergl(
+            x=epoch_ms(series.index[keep]),
+            y=series.to_numpy(dtype=np.float32)[keep],
+            name=symbol,
+            mode='lines'
+        ))
+    
+    fig.update_layout(
+        title=f"Normalized Performance (Base 100) - {period}",
+        xaxis_title="Date",
+        yaxis_title="Performance (Base 100)",
+        height=600,
+        uirevision=f"performance-{period}-{'-'.join(symbols)}"
+    )
+    fig.update_xaxes(type='date')
+    return fig
+
+@st.cache_resource(ttl=3600)
+def build_volume_fig(symbols, period):
+    fig = go.Figure()
+    
+    for symbol, data in get_stock_data(symbols, period).items():
+        # Long periods are summed over runs of consecutive days rather than
+        # sampled, so every day's volume is counted
+        starts = bucket_starts(len(data['data']))
+        fig.add_trace(go.Bar(
+            x=epoch_ms(data['data'].index[starts]),
+            y=np.add.reduceat(data['data']['Volume'].to_numpy(), starts),
+            name=symbol,
+            opacity=0.7
+        ))
+    
+    fig.update_layout(
+        title=f"Trading Volume Comparison - {period}",
+        xaxis_title="Date",
+        yaxis_title="Volume",
+        height=600,
+        barmode='group',
+        uirevision=f"volume-{period}-{'-'.join(symbols)}"
+    )
+    fig.update_xaxes(type='date')
+    return fig
+
+@st.cache_resource(ttl=3600)
+def build_returns_fig(symbols, period):
+    # Daily returns for every stock in one pass; each stock's return is against
+    # its own previous close, skipping dates only another stock traded on
+    closes = get_closes(symbols, period)
+    returns = closes.ffill().pct_change(fill_method=None).where(closes.notna()) * 100
+    
+    fig = go.Figure()
+    
+    for symbol in returns.columns:
+        fig.add_trace(go.Box(
+            y=returns[symbol].to_numpy(),
+            name=symbol,
+            boxpoints='outliers'
+        ))
+    
+    fig.update_layout(
+        title="Daily Returns Distribution",
+        yaxis_title="Daily Return (%)",
+        height=400
+    )
+    return fig
+
 if selected_stocks:
     # Get data for selected stocks
     stock_data = get_stock_data(selected_stocks, selected_period)
@@ -136,23 +207,7 @@ if selected_stocks:
         
         with tab1:
             # Price comparison chart
-            fig_price = go.Figure()
-            
-            for symbol, data in stock_data.items():
-                fig_price.add_trace(go.Scatter(
-                    x=data['data'].index,
-                    y=data['data']['Close'],
-                    name=symbol,
-                    mode='lines'
-                ))
-            
-            fig_price.update_layout(
-                title=f"Price Comparison - {selected_period}",
-                xaxis_title="Date",
-                yaxis_title="Price (₹)",
-                height=600
-            )
-            st.plotly_chart(fig_price, use_container_width=True)
+            st.plotly_chart(build_price_fig(selected_stocks, selected_period), use_container_width=True)
             
             # Display current metrics
             st.subheader("Current Metrics")
@@ -171,80 +226,41 @@ if selected_stocks:
             # Performance comparison
             st.subheader("Performance Analysis")
             
-            # Calculate normalized performance (starting at 100)
-            fig_performance = go.Figure()
-            
-            for symbol, data in stock_data.items():
-                normalized = (data['data']['Close'] / data['data']['Close'].iloc[0]) * 100
-                fig_performance.add_trace(go.Scatter(
-                    x=data['data'].index,
-                    y=normalized,
-                    name=symbol,
-                    mode='lines'
-                ))
-            
-            fig_performance.update_layout(
-                title=f"Normalized Performance (Base 100) - {selected_period}",
-                xaxis_title="Date",
-                yaxis_title="Performance (Base 100)",
-                height=600
-            )
-            st.plotly_chart(fig_performance, use_container_width=True)
+            # Normalized performance (starting at 100)
+            st.plotly_chart(build_performance_fig(selected_stocks, selected_period), use_container_width=True)
             
             # Daily returns comparison
-            fig_returns = go.Figure()
-            
-            for symbol, data in stock_data.items():
-                fig_returns.add_trace(go.Box(
-                    y=data['data']['Daily Return'],
-                    name=symbol,
-                    boxpoints='outliers'
-                ))
-            
-            fig_returns.update_layout(
-                title="Daily Returns Distribution",
-                yaxis_title="Daily Return (%)",
-                height=400
-            )
-            st.plotly_chart(fig_returns, use_container_width=True)
+            st.plotly_chart(build_returns_fig(selected_stocks, selected_period), use_container_width=True)
         
         with tab3:
             # Volume analysis
             st.subheader("Volume Analysis")
             
             # Volume comparison chart
-            fig_volume = go.Figure()
-            
-            for symbol, data in stock_data.items():
-                fig_volume.add_trace(go.Bar(
-                    x=data['data'].index,
-                    y=data['data']['Volume'],
-                    name=symbol,
-                    opacity=0.7
-                ))
-            
-            fig_volume.update_layout(
-                title=f"Trading Volume Comparison - {selected_period}",
-                xaxis_title="Date",
-                yaxis_title="Volume",
-                height=600,
-                barmode='group'
-            )
-            st.plotly_chart(fig_volume, use_container_width=True)
+            st.plotly_chart(build_volume_fig(selected_stocks, selected_period), use_container_width=True)
             
             # Volume statistics
             st.subheader("Volume Statistics")
-            volume_data = []
+            # One date-aligned volume frame; each stock's stats come from one agg
+            volumes = pd.concat({symbol: data['data']['Volume'] for symbol, data in stock_data.items()}, axis=1)
+            volume_stats = volumes.agg(['mean', 'max', 'min']).T.rename(columns={
+                'mean': 'Average Volume',
+                'max': 'Max Volume',
+                'min': 'Min Volume'
+            })
+            volume_stats = volume_stats.rename_axis('Stock').reset_index()
             
-            for symbol, data in stock_data.items():
-                volume_data.append({
-                    'Stock': symbol,
-                    'Average Volume': f"{float(data['volume']):,.0f}",
-                    'Max Volume': f"{float(data['data']['Volume'].max()):,.0f}",
-                    'Min Volume': f"{float(data['data']['Volume'].min()):,.0f}"
-                })
-            
-            st.dataframe(pd.DataFrame(volume_data), use_container_width=True)
+            # Numbers stay numeric and are formatted by the grid
+            volume_format = st.column_config.NumberColumn(format='%d')
+            st.dataframe(
+                volume_stats,
+                column_config={
+                    'Average Volume': volume_format,
+                    'Max Volume': volume_format,
+                    'Min Volume': volume_format
+                },
+                use_container_width=True
+            )
     else:
         st.warning("No data available for the selected stocks. Please try different stocks or time period.")
 else:
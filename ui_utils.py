@@ -0,0 +1,14 @@
+import os
+import streamlit as st
+
+ASSETS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'assets')
+
+@st.cache_resource
+def load_css(filename):
+    """Read a stylesheet from the assets folder once per process"""
+    with open(os.path.join(ASSETS_DIR, filename)) as f:
+        return f"<style>\n{f.read()}</style>"
+
+def inject_css(filename):
+    # Must be emitted on every rerun; elements not re-sent are removed from the page
+    st.markdown(load_css(filename), unsafe_allow_html=True)
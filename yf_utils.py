@@ -0,0 +1,127 @@
+import os
+import time
+import hashlib
+import tempfile
+import pandas as pd
+import streamlit as st
+import yfinance as yf
+
+# On-disk cache for downloaded price data; survives Streamlit restarts
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.yf_cache')
+CACHE_TTL = 3600  # 1 hour, unless the caller passes its own ttl
+
+@st.cache_resource
+def get_yf_session():
+    """Create one HTTP session shared by every yfinance request"""
+    try:
+        # Newer yfinance releases only accept curl_cffi sessions
+        from curl_cffi import requests as curl_requests
+        return curl_requests.Session(impersonate="chrome")
+    except ImportError:
+        pass
+
+    import requests
+    session = requests.Session()
+    session.headers.update({'User-Agent': 'Mozilla/5.0'})
+    return session
+
+def get_ticker(symbol):
+    """yf.Ticker on the shared session"""
+    # Built per call on purpose: a Ticker memoizes .info, so a long-lived one
+    # would defeat the TTLs of the callers' caches
+    return yf.Ticker(symbol, session=get_yf_session())
+
+def _cache_path(*key):
+    digest = hashlib.md5(repr(key).encode()).hexdigest()
+    return os.path.join(CACHE_DIR, f"{digest}.pkl")
+
+def _read_cache(path, ttl):
+    """Cached frame at path, or None when missing, older than ttl or unreadable"""
+    try:
+        if time.time() - os.path.getmtime(path) >= ttl:
+            return None
+        return pd.read_pickle(path)
+    except Exception:
+        # A missing, truncated or corrupt pickle is just a cache miss
+        return None
+
+def _write_cache(data, path):
+    # Written to a temp file and renamed so readers never see a partial pickle
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=CACHE_DIR, suffix='.tmp')
+    os.close(fd)
+    try:
+        data.to_pickle(tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        os.remove(tmp)
+        raise
+
+def download(tickers, fields=None, refresh=False, ttl=CACHE_TTL, **kwargs):
+    """Batched yf.download backed by the on-disk cache"""
+    # Callers wrapped in st.cache_data pass their own ttl so a fresh in-memory
+    # entry is never built from a disk entry older than that ttl
+    # Sorted so the same set of tickers in any order shares one cache entry
+    tickers = tuple(sorted(tickers))
+    fields = tuple(fields) if fields is not None else None
+    path = _cache_path('download', tickers, fields, sorted(kwargs.items()))
+    cached = None if refresh else _read_cache(path, ttl)
+    if cached is not None:
+        return cached
+
+    data = yf.download(list(tickers), threads=True, progress=False,
+                       session=get_yf_session(), **kwargs)
+    if fields is not None and not data.empty:
+        # Drop unused OHLCV columns before they are cached or copied
+        level = 1 if kwargs.get('group_by') == 'ticker' else 0
+        data = data.loc[:, data.columns.get_level_values(level).isin(fields)]
+    if not data.empty:
+        _write_cache(data, path)
+    return data
+
+def history(symbol, period, interval='1d', refresh=False, ttl=CACHE_TTL):
+    """Ticker.history backed by the on-disk cache"""
+    path = _cache_path('history', symbol, period, interval)
+    cached = None if refresh else _read_cache(path, ttl)
+    if cached is not None:
+        return cached
+
+    hist = get_ticker(symbol).history(period=period, interval=interval)
+    if not hist.empty:
+        _write_cache(hist, path)
+    return hist
+
+def histories(symbols, period, interval='1d', refresh=False, ttl=CACHE_TTL):
+    """Per-symbol history frames, fetching every cache miss in one batched yf.download"""
+    # Own cache namespace: yf.download frames differ from Ticker.history ones
+    # (no Dividends/Stock Splits columns, index tz varies by yfinance version)
+    data, missing = {}, []
+    for symbol in symbols:
+        cached = None if refresh else _read_cache(_cache_path('histories', symbol, period, interval), ttl)
+        if cached is not None:
+            data[symbol] = cached
+        else:
+            missing.append(symbol)
+
+    if missing:
+        raw = yf.download(missing, period=period, interval=interval, group_by='ticker',
+                          auto_adjust=True, threads=True, progress=False,
+                          session=get_yf_session())
+        for symbol in missing:
+            if isinstance(raw.columns, pd.MultiIndex):
+                if symbol not in raw.columns.get_level_values(0):
+                    continue
+                hist = raw[symbol]
+            elif len(missing) == 1:
+                # Older yfinance returns flat columns for a single ticker
+                hist = raw
+            else:
+                continue
+            # Each ticker's own rows; other tickers' trading days leave all-NaN rows
+            hist = hist.dropna(how='all')
+            if hist.index.tz is not None:
+                hist = hist.tz_localize(None)
+            if not hist.empty:
+                _write_cache(hist, _cache_path('histories', symbol, period, interval))
+                data[symbol] = hist
+    return data